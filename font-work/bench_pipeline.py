@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Benchmark the glyph asset pipeline on synthetic inputs of controlled size.
+
+Synthetic numbers sheets are drawn from the aligned_clean_1024 masters as bright
+outlines on a noisy dark background, 4x3 glyphs like GRAFFITI_FAT_NUMBERS.png.
+The 1x sheet is 1024x768 (glyphs ~190px tall, as in the original QC report);
+--scales are area multipliers (1..16). A synthetic glyph_png directory (black on
+white, 48 glyphs per 1x) feeds the normalization stage.
+
+Stages: detection, cleanup, shadow, alignment, encode, zip, normalization, and
+font_import when fontforge is importable (skipped otherwise); encode and zip go
+through the numbers pack's encode_png and ZipPackager. Each stage reports
+the median wall time of --repeat untraced runs and the peak traced allocation
+of one further run (tracemalloc: Python + numpy buffers; PIL's own buffers are
+not traced). Timing and tracing are kept apart because tracemalloc's overhead
+would otherwise end up in the baseline seconds.
+
+--save-baseline writes the results as the new baseline; otherwise, if the
+baseline file exists, any stage slower than baseline * (1 + --threshold) fails.
+
+Usage:
+  python3 font-work/bench_pipeline.py --scales 1,4,16 --save-baseline
+  python3 font-work/bench_pipeline.py --scales 1,4,16 --threshold 0.25
+"""
+from __future__ import annotations
+import argparse, json, math, statistics, sys, tempfile, time, tracemalloc
+from argparse import Namespace
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from scipy import ndimage
+
+FONT_WORK = Path(__file__).resolve().parent
+sys.path.insert(0, str(FONT_WORK / "graffiti_numbers_cleaned_pack"))
+
+import make_graffiti_numbers_clean as numbers  # noqa: E402
+import normalize_glyphs_batch  # noqa: E402
+
+MASTERS = FONT_WORK / "graffiti_numbers_cleaned_pack" / "aligned_clean_1024"
+EPS_DIR = FONT_WORK / "glyph_eps_clean"
+SHEET_ORDER = ["2","1","0","3","6","7","4","5","6_alt","7_alt","8","9"]
+BASE_CELL = 256
+
+
+def synth_sheet(scale: float, seed: int = 0) -> Image.Image:
+    cell = int(round(BASE_CELL * math.sqrt(scale)))
+    rng = np.random.default_rng(seed)
+    sheet = np.full((cell*3, cell*4), 40, np.float32) + rng.normal(0, 2, (cell*3, cell*4))
+    stroke = max(1, cell // 100)
+    for i, name in enumerate(SHEET_ORDER):
+        a = Image.open(MASTERS / f"{name}.png").getchannel("A").resize((int(cell*0.8),)*2, Image.BILINEAR)
+        a = np.asarray(a) > 128
+        edge = a ^ ndimage.binary_erosion(a, iterations=stroke)
+        r, c = divmod(i, 4)
+        y0, x0 = r*cell + cell//10, c*cell + cell//10
+        sheet[y0:y0+edge.shape[0], x0:x0+edge.shape[1]][edge] = 220
+    return Image.fromarray(sheet.clip(0, 255).astype(np.uint8)).convert("RGB")
+
+
+def synth_glyph_dir(out_dir: Path, count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    masters = [Image.open(MASTERS / f"{n}.png").getchannel("A") for n in SHEET_ORDER]
+    for i in range(count):
+        size = int(rng.integers(160, 320))
+        a = masters[i % len(masters)].resize((size, size), Image.BILINEAR)
+        Image.fromarray(255 - np.asarray(a)).save(out_dir / f"g{i:05d}.png")
+
+
+def measure(fn, repeat: int):
+    """Median wall time of `repeat` untraced runs, then peak allocation from one extra traced run.
+
+    tracemalloc slows allocation-heavy stages a lot, so it never runs while timing.
+    """
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    tracemalloc.start()
+    try:
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": statistics.median(times), "peak_bytes": peak}, result
+
+
+def bench_scale(scale: float, repeat: int, work: Path):
+    im = synth_sheet(scale)
+    sheet = np.asarray(im)
+    gray = np.asarray(im.convert("L"), dtype=np.float32)
+    results = {"sheet_px": int(gray.size)}
+
+    results["detection"], (n, bboxes) = measure(
+        lambda: numbers.find_glyph_groups(numbers.sheet_line_mask(gray)), repeat)
+    boxes = [bb[1:5] for bb in bboxes]
+
+    def cleanup():
+        tights = []
+        for x0, y0, x1, y1 in boxes:
+            crop = numbers.extract_crop_array(sheet, x0, y0, x1, y1, pad=30)
+            mask = numbers.clean_mask_from_crop(crop)
+            tights.append(numbers.tight_crop_rgba(numbers.rgba_from_mask(crop, mask, alpha_blur=0.6), pad=10))
+        return tights
+    results["cleanup"], tights = measure(cleanup, repeat)
+
+    results["alignment"], aligned = measure(
+        lambda: [numbers.aligned_canvas(t)[0] for t in tights], repeat)
+
+    results["shadow"], shadows = measure(
+        lambda: [numbers.add_shadow_rgba(t, dx=14, dy=14, blur=8, opacity=180) for t in tights]
+              + [numbers.add_shadow_rgba(a, dx=20, dy=20, blur=12, opacity=160) for a in aligned], repeat)
+
+    results["encode"], blobs = measure(
+        lambda: [numbers.encode_png(img) for img in tights + aligned + shadows], repeat)
+
+    qc = json.dumps({"bboxes": boxes}, indent=2).encode("utf-8")
+    zip_path = work / f"numbers_{scale:g}.zip"
+
+    def pack():
+        with numbers.ZipPackager(zip_path) as z:
+            for i, b in enumerate(blobs):
+                z.add(f"{i}.png", b)
+            z.add("qc_numbers.json", qc)
+        return zip_path.stat().st_size
+    results["zip"], _ = measure(pack, repeat)
+
+    glyph_dir = work / f"glyphs_{scale:g}"
+    synth_glyph_dir(glyph_dir, int(48 * scale))
+    norm_args = Namespace(mode="v2", ink_thresh=245, target_height=380, bottom_margin=70,
+                          side_margin=40, keep_pad=10)
+    paths = sorted(glyph_dir.glob("*.png"))
+    out_dir = work / f"norm_{scale:g}"
+    out_dir.mkdir(exist_ok=True)
+
+    def normalize():
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            return normalize_glyphs_batch.normalize_batch(paths, out_dir, 512, 512, norm_args, pool)
+    results["normalization"], _ = measure(normalize, repeat)
+
+    try:
+        import fontforge
+    except ImportError:
+        results["font_import"] = {"skipped": "fontforge not available"}
+    else:
+        def font_import():
+            f = fontforge.font()
+            for i, p in enumerate(sorted(EPS_DIR.glob("*.eps"))):
+                g = f.createChar(0xE000 + i)
+                g.importOutlines(str(p))
+                g.correctDirection(); g.removeOverlap(); g.simplify()
+        results["font_import"], _ = measure(font_import, repeat)
+
+    results["glyph_groups_found"] = int(n)
+    return results
+
+
+def compare(results, baseline, threshold: float):
+    failures = []
+    for scale, stages in results.items():
+        base = baseline.get(scale, {})
+        for stage, r in stages.items():
+            b = base.get(stage)
+            if not isinstance(r, dict) or "seconds" not in r or not isinstance(b, dict) or "seconds" not in b:
+                continue
+            limit = b["seconds"] * (1 + threshold)
+            if r["seconds"] > limit:
+                failures.append(f"{scale}x {stage}: {r['seconds']:.3f}s > {limit:.3f}s "
+                                f"(baseline {b['seconds']:.3f}s +{threshold:.0%})")
+    return failures
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scales", default="1,4,16", help="Comma-separated sheet area multipliers")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--baseline", default=str(FONT_WORK / "bench_baseline.json"))
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    ap.add_argument("--out", help="Also write results JSON here")
+    args = ap.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as tmp:
+        for s in args.scales.split(","):
+            scale = float(s)
+            key = f"{scale:g}"
+            results[key] = bench_scale(scale, args.repeat, Path(tmp))
+            print(f"{key}x sheet ({results[key]['sheet_px']} px)")
+            for stage, r in results[key].items():
+                if isinstance(r, dict) and "seconds" in r:
+                    print(f"  {stage:<14} {r['seconds']*1000:9.1f} ms  peak {r['peak_bytes']/2**20:8.1f} MiB")
+                elif isinstance(r, dict):
+                    print(f"  {stage:<14} skipped ({r['skipped']})")
+
+    report = {"python": sys.version.split()[0], "results": results}
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved baseline: {baseline_path}")
+        return
+    if baseline_path.exists():
+        failures = compare(results, json.loads(baseline_path.read_text())["results"], args.threshold)
+        if failures:
+            raise SystemExit("Performance regression:\n  " + "\n  ".join(failures))
+        print(f"No regressions vs {baseline_path} (threshold {args.threshold:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,25 @@
 import os
 import fontforge
 
+from glyph_cache import GlyphCache, contours_to_layer, layer_to_contours
+from web_font import WOFF2_MISSING, report_sizes, woff2_available, write_woff2
+
 FONT_NAME = "JanGraffClock"
 SVG_DIR = os.path.join(os.getcwd(), "glyph_svg")
 OUT_TTF = os.path.join(os.getcwd(), f"{FONT_NAME}.ttf")
+OUT_WOFF2 = os.path.join(os.getcwd(), f"{FONT_NAME}.woff2")
+CACHE_DIR = os.path.join(os.getcwd(), ".glyph_cache", "autoalign")
 
 EM = 1000
 ASCENT = 800
 DESCENT = 200
+WEB_HINTING = False  # True keeps autoHint() instructions in the WOFF2
 
 ADV_DIGIT = 650   # lower = tighter
 ADV_PUNCT = 360
 TIGHTEN = 40      # 20..80
+SCALE_FRAC = 0.90
+BASELINE_PAD = 20
 
 MAP = {
     "0": ord("0"), "1": ord("1"), "2": ord("2"), "3": ord("3"), "4": ord("4"),
@@ -28,7 +36,7 @@ def import_and_clean(g, path):
     g.simplify()
     g.round()
 
-def scale_to_ascent(g, frac=0.90):
+def scale_to_ascent(g, frac=SCALE_FRAC):
     xmin, ymin, xmax, ymax = g.boundingBox()
     h = max(1.0, ymax - ymin)
     s = (ASCENT * frac) / h
@@ -36,7 +44,7 @@ def scale_to_ascent(g, frac=0.90):
 
 def baseline_align(g):
     xmin, ymin, xmax, ymax = g.boundingBox()
-    g.transform((1, 0, 0, 1, 0, -ymin + 20))
+    g.transform((1, 0, 0, 1, 0, -ymin + BASELINE_PAD))
 
 def center_horiz(g, adv):
     xmin, ymin, xmax, ymax = g.boundingBox()
@@ -48,7 +56,25 @@ def tighten(g, amount):
     if amount > 0:
         g.transform((1, 0, 0, 1, -amount/2.0, 0))
 
+def build_glyph(g, path, adv):
+    import_and_clean(g, path)
+    scale_to_ascent(g)
+    baseline_align(g)
+
+    g.width = adv
+
+    center_horiz(g, adv)
+    tighten(g, TIGHTEN)
+
+    g.removeOverlap()
+    g.correctDirection()
+    g.round()
+
 def main():
+    web = woff2_available()
+    if not web:
+        print(f"WARN: {WOFF2_MISSING}; writing the TTF only")
+
     f = fontforge.font()
     f.encoding = "UnicodeFull"
     f.em = EM
@@ -59,26 +85,29 @@ def main():
     f.familyname = FONT_NAME
     f.fullname = FONT_NAME
 
+    cache = GlyphCache(CACHE_DIR, {
+        "EM": EM, "ASCENT": ASCENT, "ADV_DIGIT": ADV_DIGIT, "ADV_PUNCT": ADV_PUNCT,
+        "TIGHTEN": TIGHTEN, "SCALE_FRAC": SCALE_FRAC, "BASELINE_PAD": BASELINE_PAD,
+    })
+
     added = 0
+    rebuilt = 0
     for name, cp in MAP.items():
         path = os.path.join(SVG_DIR, f"{name}.svg")
         if not os.path.exists(path):
             continue
 
         g = f.createChar(cp)
-        import_and_clean(g, path)
-        scale_to_ascent(g, 0.90)
-        baseline_align(g)
-
         adv = ADV_DIGIT if name.isdigit() else ADV_PUNCT
-        g.width = adv
-
-        center_horiz(g, adv)
-        tighten(g, TIGHTEN)
 
-        g.removeOverlap()
-        g.correctDirection()
-        g.round()
+        contours = cache.get(name, path)
+        if contours is None:
+            build_glyph(g, path, adv)
+            cache.put(name, path, layer_to_contours(g.foreground))
+            rebuilt += 1
+        else:
+            g.foreground = contours_to_layer(contours)
+        g.width = adv
         added += 1
 
     if added == 0:
@@ -86,7 +115,10 @@ def main():
 
     f.autoHint()
     f.generate(OUT_TTF)
-    print("Wrote", OUT_TTF, "glyphs:", added)
+    if web:
+        write_woff2(OUT_TTF, OUT_WOFF2, MAP.values(), keep_hinting=WEB_HINTING)
+    print("Wrote", OUT_TTF, "glyphs:", added, "rebuilt:", rebuilt)
+    report_sizes(OUT_TTF, *([OUT_WOFF2] if web else []))
 
 if __name__ == "__main__":
     main()
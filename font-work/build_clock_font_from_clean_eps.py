@@ -1,18 +1,34 @@
 #!/usr/bin/env python3
+"""
+--backend fontforge (default) builds with fontforge and the glyph cache.
+--backend fonttools needs only numpy + fontTools: one composed affine per glyph
+from a single bbox pass, cu2qu into glyf (see fonttools_backend.py).
+"""
+import argparse
 import os
-import fontforge
+
+from glyph_cache import GlyphCache, contours_to_layer, layer_to_contours
+from fonttools_backend import build_ttf, eps_glyph, glyph_metrics
+from outline_store import STORE_NAME, load_store
+from web_font import WOFF2_MISSING, report_sizes, woff2_available, write_woff2
 
 FONT_NAME = "JanGraffClock"
 EPS_DIR = "/home/bigdan7/Projects/Service-Connect/font-work/glyph_eps_clean"
 OUT_TTF = f"/home/bigdan7/Projects/Service-Connect/font-work/{FONT_NAME}.ttf"
+OUT_WOFF2 = f"/home/bigdan7/Projects/Service-Connect/font-work/{FONT_NAME}.woff2"
+STORE_PATH = os.path.join(EPS_DIR, STORE_NAME)  # python3 outline_store.py <EPS_DIR>
+CACHE_DIR = "/home/bigdan7/Projects/Service-Connect/font-work/.glyph_cache/clean_eps"
 
 EM = 1000
 ASCENT = 800
 DESCENT = 200
+WEB_HINTING = False  # True keeps autoHint() instructions in the WOFF2
 
 ADV_DIGIT = 700
 ADV_PUNCT = 380
 TIGHTEN = 0
+SCALE_FRAC = 0.95
+BASELINE_PAD = 10
 
 MAP = {
     "0": ord("0"), "1": ord("1"), "2": ord("2"), "3": ord("3"), "4": ord("4"),
@@ -20,15 +36,21 @@ MAP = {
     "colon": ord(":"), "dash": ord("-"),
 }
 
-def import_and_clean(g, path):
+def import_and_clean(g, path, store=None):
     g.clear()
-    g.importOutlines(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    if store is not None and store.fresh(name, path):
+        pen = g.glyphPen()
+        store.draw(name, pen)
+        del pen  # finalizes the outline
+    else:
+        g.importOutlines(path)
     g.correctDirection()
     g.removeOverlap()
     g.simplify()
     g.round()
 
-def scale_to_ascent(g, frac=0.95):
+def scale_to_ascent(g, frac=SCALE_FRAC):
     xmin, ymin, xmax, ymax = g.boundingBox()
     h = max(1.0, ymax - ymin)
     s = (ASCENT * frac) / h
@@ -36,7 +58,7 @@ def scale_to_ascent(g, frac=0.95):
 
 def baseline_align(g):
     xmin, ymin, xmax, ymax = g.boundingBox()
-    g.transform((1, 0, 0, 1, 0, -ymin + 10))
+    g.transform((1, 0, 0, 1, 0, -ymin + BASELINE_PAD))
 
 def center_horiz(g, adv):
     xmin, ymin, xmax, ymax = g.boundingBox()
@@ -48,7 +70,26 @@ def tighten(g, amount):
     if amount > 0:
         g.transform((1, 0, 0, 1, -amount/2.0, 0))
 
-def main():
+def build_glyph(g, path, adv, store=None):
+    import_and_clean(g, path, store)
+    scale_to_ascent(g)
+    baseline_align(g)
+
+    g.width = adv
+
+    center_horiz(g, adv)
+    tighten(g, TIGHTEN)
+
+    g.removeOverlap()
+    g.correctDirection()
+    g.round()
+
+def build_fontforge():
+    try:
+        import fontforge
+    except ImportError:
+        raise SystemExit("ERROR: fontforge is not importable here; try --backend fonttools")
+
     f = fontforge.font()
     f.encoding = "UnicodeFull"
     f.em = EM
@@ -58,26 +99,31 @@ def main():
     f.familyname = FONT_NAME
     f.fullname = FONT_NAME
 
+    cache = GlyphCache(CACHE_DIR, {
+        "EM": EM, "ASCENT": ASCENT, "ADV_DIGIT": ADV_DIGIT, "ADV_PUNCT": ADV_PUNCT,
+        "TIGHTEN": TIGHTEN, "SCALE_FRAC": SCALE_FRAC, "BASELINE_PAD": BASELINE_PAD,
+    })
+
+    store = load_store(STORE_PATH)
+
     added = 0
+    rebuilt = 0
     for name, cp in MAP.items():
         eps = os.path.join(EPS_DIR, f"{name}.eps")
         if not os.path.exists(eps):
             continue
 
         g = f.createChar(cp)
-        import_and_clean(g, eps)
-        scale_to_ascent(g, 0.95)
-        baseline_align(g)
-
         adv = ADV_DIGIT if name.isdigit() else ADV_PUNCT
-        g.width = adv
-
-        center_horiz(g, adv)
-        tighten(g, TIGHTEN)
 
-        g.removeOverlap()
-        g.correctDirection()
-        g.round()
+        contours = cache.get(name, eps)
+        if contours is None:
+            build_glyph(g, eps, adv, store)
+            cache.put(name, eps, layer_to_contours(g.foreground))
+            rebuilt += 1
+        else:
+            g.foreground = contours_to_layer(contours)
+        g.width = adv
         added += 1
 
     if added == 0:
@@ -85,7 +131,61 @@ def main():
 
     f.autoHint()
     f.generate(OUT_TTF)
-    print("Wrote", OUT_TTF, "glyphs:", added)
+    return added, rebuilt
+
+def fonttools_glyph(name, eps, store=None):
+    """(adv, cmds, pts) of one glyph, laid out like build_glyph()."""
+    adv = ADV_DIGIT if name.isdigit() else ADV_PUNCT
+    return eps_glyph(eps, adv, ASCENT * SCALE_FRAC, BASELINE_PAD, TIGHTEN, store)
+
+def build_fonttools(out_ttf=OUT_TTF):
+    store = load_store(STORE_PATH)
+    glyphs = {}
+    for name, cp in MAP.items():
+        eps = os.path.join(EPS_DIR, f"{name}.eps")
+        if not os.path.exists(eps):
+            continue
+        glyphs[cp] = fonttools_glyph(name, eps, store)
+
+    if not glyphs:
+        raise SystemExit(f"ERROR: No glyphs imported. Expected EPS in {EPS_DIR}")
+
+    build_ttf(glyphs, out_ttf, FONT_NAME, EM, ASCENT, DESCENT, ADV_PUNCT)
+    return len(glyphs), len(glyphs)
+
+def compare_backends():
+    """Per-glyph advance/bbox differences, fonttools build minus fontforge build (OUT_TTF)."""
+    build_fontforge()
+    alt = OUT_TTF[:-4] + ".fonttools.ttf"
+    build_fonttools(alt)
+    ff, ft = glyph_metrics(OUT_TTF), glyph_metrics(alt)
+    os.remove(alt)
+    worst = 0
+    for name, cp in MAP.items():
+        if cp not in ff or cp not in ft:
+            continue
+        d = [b - a for a, b in zip(ff[cp], ft[cp])]
+        worst = max(worst, *map(abs, d))
+        print(f"  {name:<6} adv {d[0]:+d}  xMin {d[1]:+d}  yMin {d[2]:+d}  xMax {d[3]:+d}  yMax {d[4]:+d}")
+    print("Max metric difference:", worst, "units")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backend", choices=["fontforge", "fonttools"], default="fontforge")
+    ap.add_argument("--compare-backends", action="store_true",
+                    help="Build with both backends and print per-glyph metric differences (needs fontforge)")
+    args = ap.parse_args()
+    if args.compare_backends:
+        return compare_backends()
+    web = woff2_available()
+    if not web:
+        print(f"WARN: {WOFF2_MISSING}; writing the TTF only")
+
+    added, rebuilt = build_fontforge() if args.backend == "fontforge" else build_fonttools()
+    if web:
+        write_woff2(OUT_TTF, OUT_WOFF2, MAP.values(), keep_hinting=WEB_HINTING)
+    print("Wrote", OUT_TTF, "glyphs:", added, "rebuilt:", rebuilt)
+    report_sizes(OUT_TTF, *([OUT_WOFF2] if web else []))
 
 if __name__ == "__main__":
     main()
@@ -1,14 +1,26 @@
 #!/usr/bin/env python3
 import os
+from pathlib import Path
+
 import fontforge
 
+from glyph_cache import contours_to_layer
+from trace_glyphs import trace_pngs
+from web_font import WOFF2_MISSING, report_sizes, woff2_available, write_woff2
+
 FONT_NAME = "JanGraffClock"
 PNG_DIR = "/home/bigdan7/Projects/Service-Connect/font-work/glyph_png_norm"
 OUT_TTF = f"/home/bigdan7/Projects/Service-Connect/font-work/{FONT_NAME}.ttf"
+OUT_WOFF2 = f"/home/bigdan7/Projects/Service-Connect/font-work/{FONT_NAME}.woff2"
 
 EM = 1000
 ASCENT = 800
 DESCENT = 200
+WEB_HINTING = False  # True keeps autoHint() instructions in the WOFF2
+TRACER = "native"  # trace_glyphs.py in-process; "autotrace" = importImage + autoTrace
+TRACE_TOLERANCE = 0.6  # source px
+TRACE_SCALE = 2.2  # glyph_png_norm digits are glyph_png upscaled ~2.2x (normalize_glyphs_v2 --target-height 380)
+TRACE_JOBS = os.cpu_count() or 1
 
 ADV_DIGIT = 650
 ADV_PUNCT = 360
@@ -21,6 +33,10 @@ MAP = {
 }
 
 def main():
+    web = woff2_available()
+    if not web:
+        print(f"WARN: {WOFF2_MISSING}; writing the TTF only")
+
     f = fontforge.font()
     f.encoding = "UnicodeFull"
     f.em = EM
@@ -30,17 +46,24 @@ def main():
     f.familyname = FONT_NAME
     f.fullname = FONT_NAME
 
+    pngs = {name: os.path.join(PNG_DIR, f"{name}.png") for name in MAP}
+    pngs = {name: p for name, p in pngs.items() if os.path.exists(p)}
+    traced = trace_pngs(pngs.values(), jobs=TRACE_JOBS, tol=TRACE_TOLERANCE, scale=TRACE_SCALE) if TRACER == "native" else {}
+
     added = 0
     for name, cp in MAP.items():
-        png = os.path.join(PNG_DIR, f"{name}.png")
-        if not os.path.exists(png):
+        png = pngs.get(name)
+        if png is None:
             continue
 
         g = f.createChar(cp)
 
-        # Import bitmap, then autotrace to outlines
-        g.importImage(png)
-        g.autoTrace()
+        if TRACER == "native":
+            g.foreground = contours_to_layer(traced[Path(png)])
+        else:
+            # Import bitmap, then autotrace to outlines
+            g.importImage(png)
+            g.autoTrace()
 
         g.correctDirection()
         g.removeOverlap()
@@ -77,7 +100,10 @@ def main():
 
     f.autoHint()
     f.generate(OUT_TTF)
+    if web:
+        write_woff2(OUT_TTF, OUT_WOFF2, MAP.values(), keep_hinting=WEB_HINTING)
     print("Wrote", OUT_TTF, "glyphs:", added)
+    report_sizes(OUT_TTF, *([OUT_WOFF2] if web else []))
 
 if __name__ == "__main__":
     main()
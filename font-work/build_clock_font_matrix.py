@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Build a matrix of clock-font spacing variants from one outline import.
+
+build_clock_font_from_eps.py, _from_clean_eps.py and _autoalign.py only differ
+in their source directory and the spacing constants below. This imports and
+cleans every source outline once in the parent process, then builds each
+parameter set in a worker process (the imported outlines are handed to every
+worker once, at pool start) and writes one font per variant plus a summary
+table (summary.json and a printed table with the mean digit side bearings).
+
+Parameter sets start from a --preset (the constants of one of the three
+scripts) and are varied with a grid and/or a JSON list:
+  --grid adv_digit=650,700 --grid tighten=0,40        (cartesian product)
+  --matrix variants.json   [{"name": "tight", "adv_digit": 640, "tighten": 60}, ...]
+Keys: adv_digit, adv_punct, tighten, scale_frac, baseline_pad.
+
+Backends as in build_clock_font_from_clean_eps.py: fontforge (import, cleanup
+and generate with fontforge; SVG sources work) or fonttools (EPS sources via
+the outline store, no fontforge needed).
+
+Usage:
+  python3 font-work/build_clock_font_matrix.py --preset clean_eps \\
+      --grid adv_digit=650,675,700 --grid tighten=0,20,40 --jobs 4 --out-dir /tmp/variants
+"""
+from __future__ import annotations
+import argparse, itertools, json, os, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from build_clock_font_from_clean_eps import ASCENT, DESCENT, EM, FONT_NAME, MAP, import_and_clean
+from fonttools_backend import build_ttf, layout_matrix, load_outline, place_glyph
+from glyph_cache import contours_to_layer, layer_to_contours
+from outline_store import STORE_NAME, load_store
+from web_font import WOFF2_MISSING, woff2_available, write_woff2
+
+FONT_WORK = Path(__file__).resolve().parent
+
+PRESETS = {
+    # the constants of build_clock_font_from_eps.py, _from_clean_eps.py and _autoalign.py
+    "eps": {"adv_digit": 650, "adv_punct": 360, "tighten": 40, "scale_frac": 0.90, "baseline_pad": 20},
+    "clean_eps": {"adv_digit": 700, "adv_punct": 380, "tighten": 0, "scale_frac": 0.95, "baseline_pad": 10},
+    "autoalign": {"adv_digit": 650, "adv_punct": 360, "tighten": 40, "scale_frac": 0.90, "baseline_pad": 20},
+}
+PARAM_TYPES = {"adv_digit": int, "adv_punct": int, "tighten": int, "scale_frac": float, "baseline_pad": int}
+
+
+def variant_name(v: dict) -> str:
+    return (f"d{v['adv_digit']}_p{v['adv_punct']}_t{v['tighten']}"
+            f"_s{v['scale_frac']:g}_b{v['baseline_pad']}")
+
+
+def expand_variants(base: dict, grid, matrix_path=None):
+    """Cartesian product of --grid axes over the preset, plus any --matrix entries."""
+    axes = []
+    for spec in grid or []:
+        key, _, values = spec.partition("=")
+        if key not in PARAM_TYPES:
+            raise SystemExit(f"Unknown grid key {key!r} (expected one of {', '.join(PARAM_TYPES)})")
+        axes.append([(key, PARAM_TYPES[key](v)) for v in values.split(",")])
+    # no axes -> product() yields one empty combo, i.e. the preset itself
+    variants = [{**base, **dict(combo)} for combo in itertools.product(*axes)] if axes or not matrix_path else []
+    if matrix_path:
+        for entry in json.loads(Path(matrix_path).read_text()):
+            v = {**base, **{k: PARAM_TYPES[k](x) for k, x in entry.items() if k in PARAM_TYPES}}
+            if "name" in entry:
+                v["name"] = entry["name"]
+            variants.append(v)
+    for v in variants:
+        v.setdefault("name", variant_name(v))
+    return variants
+
+
+def import_outlines(src_dir: Path, backend: str) -> dict:
+    """Import + clean every source once; {glyph name: outline} in a form workers can rebuild from."""
+    sources = {}
+    for name in MAP:
+        for ext in (".eps", ".svg"):
+            p = src_dir / f"{name}{ext}"
+            if p.exists():
+                sources[name] = p
+                break
+    if not sources:
+        raise SystemExit(f"ERROR: No EPS/SVG glyph sources in {src_dir}")
+
+    store = load_store(src_dir / STORE_NAME)
+    if backend == "fonttools":
+        outlines = {}
+        for name, p in sources.items():
+            if p.suffix != ".eps":
+                raise SystemExit(f"ERROR: the fonttools backend reads EPS sources only ({p})")
+            cmds, pts = load_outline(p, store)
+            outlines[name] = (cmds, np.round(pts))  # g.round() after import
+        return outlines
+
+    try:
+        import fontforge
+    except ImportError:
+        raise SystemExit("ERROR: fontforge is not importable here; try --backend fonttools")
+    f = fontforge.font()
+    outlines = {}
+    for name, p in sources.items():
+        g = f.createChar(MAP[name])
+        import_and_clean(g, str(p), store)
+        outlines[name] = layer_to_contours(g.foreground)
+    return outlines
+
+
+_OUTLINES = None
+
+
+def _init_worker(outlines):
+    global _OUTLINES
+    _OUTLINES = outlines
+
+
+def _advance(name: str, v: dict) -> int:
+    return v["adv_digit"] if name.isdigit() else v["adv_punct"]
+
+
+def _build_fonttools(v: dict, out_ttf: str):
+    glyphs = {}
+    for name, (cmds, pts) in _OUTLINES.items():
+        glyphs[MAP[name]] = place_glyph(cmds, pts, _advance(name, v), ASCENT * v["scale_frac"],
+                                        v["baseline_pad"], v["tighten"])
+    build_ttf(glyphs, out_ttf, FONT_NAME, EM, ASCENT, DESCENT, v["adv_punct"])
+
+
+def _build_fontforge(v: dict, out_ttf: str):
+    import fontforge
+
+    f = fontforge.font()
+    f.encoding = "UnicodeFull"
+    f.em = EM
+    f.ascent = ASCENT
+    f.descent = DESCENT
+    f.fontname = FONT_NAME
+    f.familyname = FONT_NAME
+    f.fullname = FONT_NAME
+    for name, contours in _OUTLINES.items():
+        g = f.createChar(MAP[name])
+        g.foreground = contours_to_layer(contours)
+        adv = _advance(name, v)
+        g.width = adv
+        # scale_to_ascent -> baseline_align -> center_horiz -> tighten as one transform
+        g.transform(layout_matrix(g.boundingBox(), adv, ASCENT * v["scale_frac"], v["baseline_pad"], v["tighten"]))
+        g.removeOverlap()
+        g.correctDirection()
+        g.round()
+    f.autoHint()
+    f.generate(out_ttf)
+
+
+def side_bearings(ttf_path: str):
+    """Mean (lsb, rsb) over the digit glyphs, read back from the TTF."""
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(ttf_path)
+    cmap = font.getBestCmap()
+    glyf, hmtx = font["glyf"], font["hmtx"]
+    lsb, rsb = [], []
+    for ch in "0123456789":
+        gname = cmap.get(ord(ch))
+        if gname is None or not hasattr(glyf[gname], "xMax"):
+            continue
+        adv, _ = hmtx[gname]
+        lsb.append(glyf[gname].xMin)
+        rsb.append(adv - glyf[gname].xMax)
+    return (float(np.mean(lsb)), float(np.mean(rsb))) if lsb else (0.0, 0.0)
+
+
+def build_variant(v: dict, out_dir: str, backend: str, woff2: bool, web_hinting: bool):
+    t = time.perf_counter()
+    out_ttf = os.path.join(out_dir, f"{FONT_NAME}-{v['name']}.ttf")
+    (_build_fontforge if backend == "fontforge" else _build_fonttools)(v, out_ttf)
+    row = {**v, "glyphs": len(_OUTLINES), "ttf": os.path.basename(out_ttf), "ttf_bytes": os.path.getsize(out_ttf)}
+    if woff2:
+        out_woff2 = out_ttf[:-4] + ".woff2"
+        write_woff2(out_ttf, out_woff2, [MAP[n] for n in _OUTLINES], keep_hinting=web_hinting)
+        row["woff2_bytes"] = os.path.getsize(out_woff2)
+    row["digit_lsb"], row["digit_rsb"] = side_bearings(out_ttf)
+    row["seconds"] = time.perf_counter() - t
+    return row
+
+
+def print_table(rows):
+    cols = ["name", "adv_digit", "adv_punct", "tighten", "scale_frac", "baseline_pad",
+            "digit_lsb", "digit_rsb", "ttf_bytes", "woff2_bytes", "seconds"]
+    cols = [c for c in cols if any(c in r for r in rows)]
+    cells = [[c for c in cols]] + [[f"{r[c]:.2f}" if isinstance(r.get(c), float) else str(r.get(c, "")) for c in cols]
+                                   for r in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(cols))]
+    for row in cells:
+        print("  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths))))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--src-dir", default=str(FONT_WORK / "glyph_eps_clean"), help="EPS (or, with fontforge, SVG) glyph sources")
+    ap.add_argument("--preset", choices=sorted(PRESETS), default="clean_eps", help="Base parameter set")
+    ap.add_argument("--grid", action="append", help="KEY=v1,v2,... axis of the variant grid; repeatable")
+    ap.add_argument("--matrix", help="JSON list of parameter overrides, one variant each")
+    ap.add_argument("--backend", choices=["fontforge", "fonttools"], default="fontforge")
+    ap.add_argument("--out-dir", default=str(FONT_WORK / "variants"))
+    ap.add_argument("--woff2", action="store_true", help="Also write a WOFF2 per variant")
+    ap.add_argument("--web-hinting", action="store_true", help="Keep autoHint() instructions in the WOFF2s")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+    if args.woff2 and not woff2_available():
+        raise SystemExit(f"ERROR: {WOFF2_MISSING}")
+
+    variants = expand_variants(PRESETS[args.preset], args.grid, args.matrix)
+    names = [v["name"] for v in variants]
+    if len(set(names)) != len(names):
+        raise SystemExit("ERROR: variant names must be unique")
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    t = time.perf_counter()
+    outlines = import_outlines(Path(args.src_dir), args.backend)
+    import_s = time.perf_counter() - t
+
+    t = time.perf_counter()
+    build = (str(out_dir), args.backend, args.woff2, args.web_hinting)
+    if args.jobs <= 1:
+        _init_worker(outlines)
+        rows = [build_variant(v, *build) for v in variants]
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker, initargs=(outlines,)) as ex:
+            rows = list(ex.map(build_variant, variants, *[[b] * len(variants) for b in build]))
+    build_s = time.perf_counter() - t
+
+    summary = {"src_dir": args.src_dir, "backend": args.backend, "preset": args.preset,
+               "import_seconds": import_s, "build_seconds": build_s, "variants": rows}
+    (out_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print_table(rows)
+    print(f"Imported {len(outlines)} outlines once in {import_s:.2f}s; "
+          f"built {len(rows)} variants in {build_s:.2f}s on {max(1, args.jobs)} workers -> {out_dir}")
+
+if __name__ == "__main__":
+    main()
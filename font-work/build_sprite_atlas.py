@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Build a tightly packed sprite atlas for the clock digits and months.
+
+Each glyph is placed in its set's logical cell (digits: the 1024px
+aligned_clean_1024 masters; months: the largest month PNG, glyphs centered),
+scaled to the requested cell height, trimmed to its alpha bbox and shelf-packed
+into one atlas. The JSON manifest records, per glyph, its rect in the atlas and
+its offset inside the logical cell, so GLYPH_MAP / MONTH_MAP in SpriteClock.tsx
+can be generated from it:
+
+  {"size": [W, H],
+   "sets": {"digits": {"cell": [cw, ch],
+                       "glyphs": {"0": {"x", "y", "w", "h", "ox", "oy"}, ...}},
+            "months": {...}}}
+
+Glyphs without a source file (":" and "-" today) get an empty rect.
+
+--ladder 1,2,3 renders the same layout at several integer scales from the
+masters (area downsampling of premultiplied alpha), writing name@1x.png,
+name@2x.png, ... Rects, offsets and cells in the manifest are in 1x px and are
+exact multiples at every level, so the client can switch files with
+image-set() and keep one set of CSS geometry. "levels" lists file, pixel size
+and bytes per level.
+
+Usage:
+  python3 font-work/build_sprite_atlas.py --digit-cell 256 --month-cell 198
+  python3 font-work/build_sprite_atlas.py --encode --budget avif=100000
+  python3 font-work/build_sprite_atlas.py --digit-cell 64 --month-cell 64 --ladder 1,2,3
+"""
+from __future__ import annotations
+import argparse, json, math
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import encode_sprites
+
+ROOT = Path(__file__).resolve().parents[1]
+FONT_WORK = ROOT / "font-work"
+
+DIGIT_NAMES = ["0","1","2","3","4","5","6","7","8","9",":","-"]
+MONTH_NAMES = ["JAN","FEB","MAR","APR","MAY","JUN","JUL","AUG","SEP","OCT","NOV","DEC"]
+FILE_NAMES = {":": "colon", "-": "dash"}
+
+
+def load_set(src_dir: Path, names):
+    """Load RGBA masters and center them in a common master cell (largest master size)."""
+    masters = {}
+    for name in names:
+        p = src_dir / f"{FILE_NAMES.get(name, name)}.png"
+        masters[name] = Image.open(p).convert("RGBA") if p.exists() else None
+    present = [im for im in masters.values() if im is not None]
+    if not present:
+        raise SystemExit(f"No glyph PNGs found in {src_dir}")
+    cw = max(im.size[0] for im in present)
+    ch = max(im.size[1] for im in present)
+    cells = {}
+    for name, im in masters.items():
+        cell = Image.new("RGBA", (cw, ch), (0,0,0,0))
+        if im is not None:
+            cell.paste(im, ((cw - im.size[0]) // 2, (ch - im.size[1]) // 2))
+        cells[name] = cell
+    return (cw, ch), cells
+
+
+def cell_size_1x(master_size, cell_h: int):
+    mw, mh = master_size
+    return max(1, int(round(mw * cell_h / mh))), cell_h
+
+
+def render_cell(master: Image.Image, size) -> Image.Image:
+    if size == master.size:
+        return master
+    # BOX on RGBA = area average of premultiplied alpha (PIL resizes RGBA via RGBa).
+    return master.resize(size, Image.Resampling.BOX)
+
+
+def trim_1x(master: Image.Image, cell_1x):
+    """Alpha bbox of the master, in 1x cell units rounded outward: (ox, oy, w, h) or None.
+
+    Rounding outward in 1x units keeps the rect an exact integer multiple at every
+    ladder level, so k * rect covers all ink of the k-times cell.
+    """
+    bb = master.getchannel("A").getbbox()
+    if bb is None:
+        return None
+    sx = cell_1x[0] / master.size[0]
+    sy = cell_1x[1] / master.size[1]
+    x0, y0 = int(math.floor(bb[0] * sx)), int(math.floor(bb[1] * sy))
+    x1, y1 = int(math.ceil(bb[2] * sx)), int(math.ceil(bb[3] * sy))
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def pack_shelves(sizes, width: int, pad: int):
+    """First-fit decreasing-height shelf packing; returns (positions, used_w, used_h)."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    shelves = []  # [y, height, next_x]
+    pos = [None] * len(sizes)
+    used_h = 0
+    for i in order:
+        w, h = sizes[i]
+        for shelf in shelves:
+            if shelf[2] + w <= width and h <= shelf[1]:
+                pos[i] = (shelf[2], shelf[0])
+                shelf[2] += w + pad
+                break
+        else:
+            y = used_h
+            shelves.append([y, h, w + pad])
+            pos[i] = (0, y)
+            used_h = y + h + pad
+    used_w = max((pos[i][0] + sizes[i][0] for i in range(len(sizes))), default=0)
+    return pos, used_w, max(0, used_h - pad)
+
+
+def pack_min_area(sizes, pad: int):
+    """Try a range of strip widths and keep the packing with the smallest area."""
+    if not sizes:
+        return [], 0, 0
+    widest = max(w for w, _ in sizes)
+    total = sum(w + pad for w, _ in sizes)
+    best = None
+    for width in np.unique(np.linspace(widest, total, num=64).astype(int)):
+        pos, uw, uh = pack_shelves(sizes, int(width), pad)
+        key = (uw * uh, abs(uw - uh))
+        if best is None or key < best[0]:
+            best = (key, pos, uw, uh)
+    return best[1], best[2], best[3]
+
+
+def layout_atlas(sets, pad: int = 2):
+    """Pack trimmed glyph rects once, in 1x units.
+
+    sets: {set_name: (cell_1x (w, h), {glyph: master RGBA})}
+    Returns the manifest: atlas size and, per glyph, its rect (x, y, w, h) in the atlas
+    and its offset (ox, oy) inside the set's cell, all in 1x px.
+    """
+    items = []  # (set_name, glyph, trim rect)
+    for set_name, (cell_1x, masters) in sets.items():
+        for glyph, master in masters.items():
+            items.append((set_name, glyph, trim_1x(master, cell_1x)))
+
+    packed = [i for i, it in enumerate(items) if it[2] is not None]
+    sizes = [(items[i][2][2], items[i][2][3]) for i in packed]
+    pos, W, H = pack_min_area(sizes, pad)
+    placed = dict(zip(packed, pos))
+
+    manifest = {"size": [W, H], "sets": {}}
+    for set_name, (cell_1x, _) in sets.items():
+        manifest["sets"][set_name] = {"cell": list(cell_1x), "glyphs": {}}
+    for i, (set_name, glyph, rect) in enumerate(items):
+        entry = {"x": 0, "y": 0, "w": 0, "h": 0, "ox": 0, "oy": 0}
+        if rect is not None:
+            ox, oy, w, h = rect
+            x, y = placed[i]
+            entry = {"x": x, "y": y, "w": w, "h": h, "ox": ox, "oy": oy}
+        manifest["sets"][set_name]["glyphs"][glyph] = entry
+    return manifest
+
+
+def render_atlas(sets, manifest, scale: int = 1) -> Image.Image:
+    """Render the atlas at an integer ladder level; every rect is scale x its 1x rect."""
+    W, H = manifest["size"]
+    atlas = Image.new("RGBA", (max(1, W * scale), max(1, H * scale)), (0,0,0,0))
+    for set_name, ((cw, ch), masters) in sets.items():
+        glyphs = manifest["sets"][set_name]["glyphs"]
+        for glyph, master in masters.items():
+            e = glyphs[glyph]
+            if not e["w"]:
+                continue
+            cell = render_cell(master, (cw * scale, ch * scale))
+            ox, oy, w, h = (v * scale for v in (e["ox"], e["oy"], e["w"], e["h"]))
+            atlas.paste(cell.crop((ox, oy, ox + w, oy + h)), (e["x"] * scale, e["y"] * scale))
+    return atlas
+
+
+def level_path(out_png: Path, scale: int, ladder) -> Path:
+    if len(ladder) == 1 and scale == 1:
+        return out_png
+    return out_png.with_name(f"{out_png.stem}@{scale}x{out_png.suffix}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--digits-dir", default=str(FONT_WORK / "graffiti_numbers_cleaned_pack" / "aligned_clean_1024"))
+    ap.add_argument("--months-dir", default=str(FONT_WORK / "graffiti_months_cleaned_pack"))
+    ap.add_argument("--digit-cell", type=int, default=256, help="Digit cell height in 1x atlas px")
+    ap.add_argument("--month-cell", type=int, default=0, help="Month cell height in 1x atlas px (default: native)")
+    ap.add_argument("--ladder", default="1", help="Comma-separated integer scales, e.g. 1,2,3 (writes name@Nx.png)")
+    ap.add_argument("--pad", type=int, default=2, help="Transparent gap between packed glyphs")
+    ap.add_argument("--out-png", default=str(ROOT / "client" / "public" / "fonts" / "clock-atlas.png"))
+    ap.add_argument("--out-json", default=str(ROOT / "client" / "public" / "fonts" / "clock-atlas.json"))
+    ap.add_argument("--encode", action="store_true", help="Also write png8/WebP/AVIF variants (see encode_sprites.py)")
+    encode_sprites.add_encode_args(ap)
+    args = ap.parse_args()
+
+    ladder = sorted({int(v) for v in args.ladder.split(",")})
+    sets = {}
+    for set_name, src, names, cell_h in [
+        ("digits", args.digits_dir, DIGIT_NAMES, args.digit_cell),
+        ("months", args.months_dir, MONTH_NAMES, args.month_cell),
+    ]:
+        master_size, masters = load_set(Path(src), names)
+        cell_1x = cell_size_1x(master_size, cell_h or master_size[1])
+        if cell_1x[1] * ladder[-1] > master_size[1]:
+            print(f"WARN: {set_name} {ladder[-1]}x cell ({cell_1x[1] * ladder[-1]}px) upsamples the {master_size[1]}px masters")
+        sets[set_name] = (cell_1x, masters)
+
+    manifest = layout_atlas(sets, pad=args.pad)
+    out_png = Path(args.out_png)
+    out_png.parent.mkdir(parents=True, exist_ok=True)
+    W, H = manifest["size"]
+    grid_px = sum(cw * ch * len(masters) for (cw, ch), masters in sets.values())
+    manifest["levels"] = []
+    written = []
+    for scale in ladder:
+        path = level_path(out_png, scale, ladder)
+        render_atlas(sets, manifest, scale).save(path, optimize=True)
+        size = path.stat().st_size
+        manifest["levels"].append({"scale": scale, "image": path.name, "size": [W * scale, H * scale], "bytes": size})
+        written.append(path)
+        print(f"Wrote {path} {W*scale}x{H*scale} ({W*H/grid_px:.0%} of grid area), {size} bytes")
+    manifest["image"] = manifest["levels"][0]["image"]
+    Path(args.out_json).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    print(f"Wrote {args.out_json}")
+
+    if args.encode:
+        encode_sprites.run(written, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression check for the sprites and aligned_clean_1024 glyphs.
+
+Every sprite is split into its grid cells and every glyph PNG is one cell. A
+cell is reduced (area resample of RGBA) to SIGNAL_SIZE px and composited over
+mid grey, so colour, alpha and placement all show up in one luma channel. Its
+perceptual hash is the sign of the horizontal and vertical gradients of a
+HASH_SIZE block mean. Cells whose hash matches the golden pass at once; only
+the others get an SSIM (all of them stacked into one gaussian-filtered batch)
+and fail below --ssim-min. PNG decoding is most of the cost, so images whose
+bytes still match the golden's sha256 are not decoded at all (--full forces
+it); the rest are decoded on a thread pool.
+
+Goldens live in one .npz (names, signals, hashes, source sizes, file digests):
+  python3 font-work/check_goldens.py --update   # accept the current images
+  python3 font-work/check_goldens.py            # gate a build (exit 1 on regressions)
+"""
+from __future__ import annotations
+import argparse, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from scipy import ndimage
+
+from glyph_cache import file_digest
+
+ROOT = Path(__file__).resolve().parents[1]
+FONT_WORK = ROOT / "font-work"
+GOLDENS = FONT_WORK / "goldens" / "goldens.npz"
+
+# (path, cols, rows)
+SPRITES = [
+    (ROOT / "client/public/fonts/glyph-sprite.png", 4, 3),
+    (ROOT / "client/public/fonts/months-sprite.png", 4, 3),
+]
+GLYPH_DIR = FONT_WORK / "graffiti_numbers_cleaned_pack" / "aligned_clean_1024"
+
+SIGNAL_SIZE = 64
+HASH_SIZE = 16
+SSIM_MIN = 0.98
+SSIM_SIGMA = 1.5
+
+
+def targets(extra=()):
+    """[(unit name prefix, path, cols, rows)] for everything under test."""
+    out = [(p.stem, p, cols, rows) for p, cols, rows in SPRITES]
+    out += [(f"{GLYPH_DIR.name}/{p.stem}", p, 1, 1) for p in sorted(GLYPH_DIR.glob("*.png"))]
+    out += [(Path(p).name, Path(p), 1, 1) for p in extra]
+    return out
+
+
+def cell_names(prefix: str, cols: int, rows: int):
+    return [prefix] if cols * rows == 1 else [f"{prefix}[{i // cols},{i % cols}]" for i in range(cols * rows)]
+
+
+def cell_signals(path: Path, cols: int, rows: int):
+    """(source size, (rows*cols, S, S) float32 luma-over-grey of every cell)."""
+    S = SIGNAL_SIZE
+    with Image.open(path) as im:
+        size = im.size
+        im = im.convert("RGBA")
+        w, h = size[0] // cols, size[1] // rows
+        small = np.asarray(im.resize((cols * S, rows * S), Image.Resampling.BOX, box=(0, 0, cols * w, rows * h)),
+                           dtype=np.float32)
+    a = small[..., 3:] / 255.0
+    luma = (small[..., :3] @ np.array([0.299, 0.587, 0.114], np.float32))[..., None]
+    sig = np.rint(luma * a + 128.0 * (1.0 - a))[..., 0]
+    return size, sig.reshape(rows, S, cols, S).transpose(0, 2, 1, 3).reshape(rows * cols, S, S)
+
+
+def phash(signals: np.ndarray) -> np.ndarray:
+    """Gradient-sign hash of each (S, S) signal at HASH_SIZE; (N, bits) bool."""
+    n, S, _ = signals.shape
+    k = S // HASH_SIZE
+    m = signals.reshape(n, HASH_SIZE, k, HASH_SIZE, k).mean(axis=(2, 4))
+    bits = HASH_SIZE * (HASH_SIZE - 1)
+    return np.concatenate([(np.diff(m, axis=2) > 0).reshape(n, bits), (np.diff(m, axis=1) > 0).reshape(n, bits)], axis=1)
+
+
+def ssim_batch(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Mean SSIM of each pair of (N, S, S) images, gaussian window, 8-bit constants."""
+    C1, C2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    sig = (0, SSIM_SIGMA, SSIM_SIGMA)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    mx, my = ndimage.gaussian_filter(x, sig), ndimage.gaussian_filter(y, sig)
+    sxx = ndimage.gaussian_filter(x * x, sig) - mx * mx
+    syy = ndimage.gaussian_filter(y * y, sig) - my * my
+    sxy = ndimage.gaussian_filter(x * y, sig) - mx * my
+    ssim = ((2 * mx * my + C1) * (2 * sxy + C2)) / ((mx * mx + my * my + C1) * (sxx + syy + C2))
+    return ssim.mean(axis=(1, 2))
+
+
+def collect(units, jobs: int):
+    """names, sizes, signals (N, S, S) for all cells of all units."""
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        results = list(pool.map(lambda u: cell_signals(*u[1:]), units))
+    names, sizes, signals = [], [], []
+    for (prefix, _, cols, rows), (size, sig) in zip(units, results):
+        names += cell_names(prefix, cols, rows)
+        sizes += [size] * len(sig)
+        signals.append(sig)
+    if not signals:
+        return names, np.zeros((0, 2), int), np.zeros((0, SIGNAL_SIZE, SIGNAL_SIZE), np.float32)
+    return names, np.array(sizes), np.concatenate(signals)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("images", nargs="*", help="Extra single-cell images to include")
+    ap.add_argument("--goldens", default=str(GOLDENS))
+    ap.add_argument("--update", action="store_true", help="Write the current images as the new goldens")
+    ap.add_argument("--ssim-min", type=float, default=SSIM_MIN)
+    ap.add_argument("--hash-tol", type=int, default=0, help="Hash bits that may differ before SSIM runs")
+    ap.add_argument("--jobs", type=int, default=4, help="Decode threads")
+    ap.add_argument("--full", action="store_true", help="Decode and compare images even when their bytes are unchanged")
+    args = ap.parse_args()
+
+    t = time.perf_counter()
+    units = [u for u in targets(args.images) if u[1].exists()]
+    digests = {u[0]: file_digest(str(u[1])) for u in units}
+    goldens = Path(args.goldens)
+
+    if args.update:
+        names, sizes, signals = collect(units, args.jobs)
+        goldens.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(goldens, names=np.array(names), sizes=sizes,
+                            signals=signals.astype(np.uint8), hashes=np.packbits(phash(signals), axis=1),
+                            files=np.array(list(digests)), digests=np.array(list(digests.values())))
+        print(f"Wrote {goldens}: {len(names)} cells from {len(units)} images ({time.perf_counter() - t:.2f}s)")
+        return
+
+    if not goldens.exists():
+        raise SystemExit(f"No goldens at {goldens}; run with --update to create them")
+    with np.load(goldens) as g:
+        gold = {n: i for i, n in enumerate(g["names"].tolist())}
+        g_sizes, g_signals, g_hashes = g["sizes"], g["signals"], g["hashes"]
+        g_digests = dict(zip(g["files"].tolist(), g["digests"].tolist()))
+
+    same = [] if args.full else [u for u in units if g_digests.get(u[0]) == digests[u[0]]]
+    unchanged = {n for u in same for n in cell_names(u[0], u[2], u[3])}
+    names, sizes, signals = collect([u for u in units if u not in same], args.jobs)
+    hashes = phash(signals)
+    g_hashes = np.unpackbits(g_hashes, axis=1)[:, :hashes.shape[1]].astype(bool)
+
+    failures = [f"{n}: no golden (run --update to accept)" for n in names if n not in gold]
+    built = unchanged | set(names)
+    failures += [f"{n}: golden image missing from this build" for n in gold if n not in built]
+    idx = np.array([i for i, n in enumerate(names) if n in gold], dtype=int)
+    gidx = np.array([gold[names[i]] for i in idx], dtype=int)
+    for i, j in zip(idx, gidx):
+        if tuple(sizes[i]) != tuple(g_sizes[j]):
+            print(f"WARN: {names[i]} source size {tuple(sizes[i])} != golden {tuple(g_sizes[j])}")
+
+    dist = (hashes[idx] != g_hashes[gidx]).sum(axis=1) if len(idx) else np.zeros(0, int)
+    changed = dist > args.hash_tol
+    scores = ssim_batch(signals[idx[changed]], g_signals[gidx[changed]]) if changed.any() else np.zeros(0)
+    for i, d, s in zip(idx[changed], dist[changed], scores):
+        status = "FAIL" if s < args.ssim_min else "ok  "
+        print(f"  {status} {names[i]:<32} hash bits {d:3d}  ssim {s:.4f}")
+        if s < args.ssim_min:
+            failures.append(f"{names[i]}: ssim {s:.4f} < {args.ssim_min}")
+
+    elapsed = time.perf_counter() - t
+    print(f"{len(idx) + len(unchanged)} cells checked: {len(unchanged)} byte-identical, {int((~changed).sum())} "
+          f"hash-identical, {int(changed.sum())} SSIM-compared ({elapsed:.2f}s)")
+    if failures:
+        raise SystemExit("Golden regressions:\n  " + "\n  ".join(failures))
+    print("Golden checks passed.")
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,124 @@
 #!/usr/bin/env python3
+"""
+Sprite QC, whole sheet and per cell.
+
+The alpha channel is viewed (zero-copy) as (rows, h, cols, w) and every cell's
+ink bbox, alpha coverage, baseline row, border-alpha bleed and horizontal
+centering offset come out of one set of vectorized reductions. A sheet fails
+when a cell is unexpectedly blank or inked, bleeds alpha onto its border, sits
+off the common baseline, is off-centre, or has coverage far from the median.
+Resolution variants next to a sprite (<stem>@2x.png, ...) are checked with the
+same grid.
+"""
+import time
 from pathlib import Path
+
+import numpy as np
 from PIL import Image
 
 root = Path('/home/bigdan7/Projects/Service-Connect')
 
+# (path, cols, rows, blank cells (row-major index), cells share a baseline)
 checks = [
-    (root / 'client/public/fonts/glyph-sprite.png', 4, 3),
-    (root / 'client/public/fonts/months-sprite.png', 4, 3),
+    (root / 'client/public/fonts/glyph-sprite.png', 4, 3, {10, 11}, True),
+    (root / 'client/public/fonts/months-sprite.png', 4, 3, set(), True),
 ]
 
-for path, cols, rows in checks:
+INK_ALPHA = 0        # alpha above this counts as ink
+BLEED_MAX = 16       # max alpha allowed on a cell's outer pixel ring
+BASELINE_TOL = 0.02  # of cell height
+CENTER_TOL = 0.05    # of cell width
+COVERAGE_RATIO = 3.0  # allowed factor between a cell's coverage and the median
+
+
+def cell_view(alpha: np.ndarray, cols: int, rows: int) -> np.ndarray:
+    """(rows, h, cols, w) view of the alpha channel; a remainder past the grid is ignored."""
+    H, W = alpha.shape
+    h, w = H // rows, W // cols
+    return alpha[:rows * h, :cols * w].reshape(rows, h, cols, w)
+
+
+def cell_metrics(cells: np.ndarray) -> dict:
+    """Per-cell arrays, all (rows, cols), in one pass over the (rows, h, cols, w) view."""
+    rows, h, cols, w = cells.shape
+    ink = cells > INK_ALPHA
+    row_ink = ink.any(axis=3)  # (rows, h, cols)
+    col_ink = ink.any(axis=1)  # (rows, cols, w)
+    inked = row_ink.any(axis=1)
+    y0 = row_ink.argmax(axis=1)
+    y1 = h - row_ink[:, ::-1].argmax(axis=1)
+    x0 = col_ink.argmax(axis=2)
+    x1 = w - col_ink[:, :, ::-1].argmax(axis=2)
+    bleed = np.maximum.reduce([cells[:, 0].max(axis=2), cells[:, -1].max(axis=2),
+                               cells[:, :, :, 0].max(axis=1), cells[:, :, :, -1].max(axis=1)])
+    return {
+        "inked": inked,
+        "bbox": np.stack([x0, y0, x1, y1], axis=-1),
+        "coverage": cells.sum(axis=(1, 3), dtype=np.int64) / (255.0 * h * w),
+        "baseline": y1,
+        "bleed": bleed,
+        "center_dx": ((x0 + x1) / 2.0 - w / 2.0) / w,
+    }
+
+
+def cell_failures(m: dict, blank: set, shared_baseline: bool, h: int) -> list:
+    rows, cols = m["inked"].shape
+    expect = np.ones((rows, cols), bool)
+    expect.flat[list(blank)] = False
+    failures = []
+    for r, c in zip(*np.nonzero(m["inked"] != expect)):
+        failures.append(f"cell {r},{c} {'has ink, expected blank' if m['inked'][r, c] else 'is blank'}")
+    ok = m["inked"] & expect
+    if not ok.any():
+        return failures
+
+    rules = [
+        (m["bleed"] > BLEED_MAX, lambda r, c: f"alpha {m['bleed'][r, c]} on its border"),
+        (np.abs(m["center_dx"]) > CENTER_TOL, lambda r, c: f"off-centre by {m['center_dx'][r, c]:+.1%} of cell width"),
+    ]
+    cov_med = np.median(m["coverage"][ok])
+    rules.append(((m["coverage"] > cov_med * COVERAGE_RATIO) | (m["coverage"] < cov_med / COVERAGE_RATIO),
+                  lambda r, c: f"coverage {m['coverage'][r, c]:.3f} vs median {cov_med:.3f}"))
+    if shared_baseline:
+        base_med = np.median(m["baseline"][ok])
+        rules.append((np.abs(m["baseline"] - base_med) > BASELINE_TOL * h,
+                      lambda r, c: f"baseline row {m['baseline'][r, c]} vs median {base_med:.0f}"))
+    for bad, msg in rules:
+        for r, c in zip(*np.nonzero(bad & ok)):
+            failures.append(f"cell {r},{c} {msg(r, c)}")
+    return failures
+
+
+def check_sprite(path: Path, cols: int, rows: int, blank: set, shared_baseline: bool) -> list:
     img = Image.open(path).convert('RGBA')
-    alpha = img.split()[-1]
-    bbox = alpha.getbbox()
+    alpha = np.asarray(img)[..., 3]
+    bbox = img.getchannel('A').getbbox()
     if not bbox:
-        raise SystemExit(f"{path} has no visible pixels")
+        return [f"{path} has no visible pixels"]
     w, h = img.size
     if w % cols or h % rows:
         print(f"WARN: {path} size not divisible by grid: {w}x{h} vs {cols}x{rows}")
-    print(f"OK: {path} size={w}x{h} bbox={bbox}")
 
-print('Sprite checks complete.')
+    t = time.perf_counter()
+    cells = cell_view(alpha, cols, rows)
+    m = cell_metrics(cells)
+    failures = [f"{path.name}: {f}" for f in cell_failures(m, blank, shared_baseline, cells.shape[1])]
+    ms = (time.perf_counter() - t) * 1000
+    cov = m["coverage"][m["inked"]]
+    print(f"OK: {path} size={w}x{h} bbox={bbox} cells={int(m['inked'].sum())}/{rows * cols} "
+          f"coverage={cov.min():.3f}..{cov.max():.3f} max_bleed={int(m['bleed'].max())} ({ms:.1f} ms)"
+          if not failures else f"FAIL: {path} ({len(failures)} cell issues, {ms:.1f} ms)")
+    return failures
+
+
+def main():
+    failures = []
+    for path, cols, rows, blank, shared_baseline in checks:
+        for p in [path] + sorted(path.parent.glob(f"{path.stem}@*x{path.suffix}")):
+            failures += check_sprite(p, cols, rows, blank, shared_baseline)
+    if failures:
+        raise SystemExit("Sprite checks failed:\n  " + "\n  ".join(failures))
+    print('Sprite checks complete.')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Encode sprite PNGs into smaller delivery formats and enforce a byte budget.
+
+Variants written next to each input (<stem>.<suffix>):
+  png8        palette PNG. Sprites are one flat colour plus alpha, so the palette
+              is that colour at every alpha level (lossless); sprites with mixed
+              colours fall back to an octree quantize.
+  webp        lossless WebP
+  webp-lossy  lossy WebP with lossless alpha (near-lossless for flat glyphs)
+  avif        AVIF (skipped when this Pillow build has no AVIF support)
+
+For every variant the report lists bytes and mean decode time. --budget fails
+the run when a variant is larger than allowed, either for all formats
+(--budget 150000) or per format (--budget webp=90000, repeatable).
+
+Usage:
+  python3 font-work/encode_sprites.py client/public/fonts/clock-atlas.png --budget avif=60000
+"""
+from __future__ import annotations
+import argparse, io, time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, features
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SPRITES = [
+    ROOT / "client/public/fonts/glyph-sprite.png",
+    ROOT / "client/public/fonts/months-sprite.png",
+]
+
+
+def flat_color(rgba: np.ndarray):
+    """The single RGB colour used by every visible pixel, or None if there is more than one."""
+    vis = rgba[..., 3] > 0
+    if not vis.any():
+        return (255, 255, 255)
+    rgb = rgba[..., :3][vis]
+    first = rgb[0]
+    return tuple(int(v) for v in first) if (rgb == first).all() else None
+
+
+def to_palette(im: Image.Image, levels: int = 256) -> Image.Image:
+    rgba = np.asarray(im.convert("RGBA"))
+    color = flat_color(rgba)
+    if color is None:
+        return im.convert("RGBA").quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    idx = (rgba[..., 3].astype(np.uint16) * levels // 256).astype(np.uint8)
+    alphas = [int(round(i * 255 / (levels - 1))) for i in range(levels)]
+    pal = Image.fromarray(idx)
+    pal.putpalette(list(color) * levels)  # "L" -> "P", indices kept
+    pal.info["transparency"] = bytes(alphas)
+    return pal
+
+
+def encode_png8(im, levels):
+    p = to_palette(im, levels)
+    kw = {"transparency": p.info["transparency"]} if "transparency" in p.info else {}
+    buf = io.BytesIO()
+    p.save(buf, format="PNG", optimize=True, **kw)
+    return buf.getvalue()
+
+
+def encode_webp(im, lossless: bool, quality: int):
+    buf = io.BytesIO()
+    if lossless:
+        im.save(buf, format="WEBP", lossless=True, quality=100, method=6, exact=False)
+    else:
+        im.save(buf, format="WEBP", quality=quality, alpha_quality=100, method=6)
+    return buf.getvalue()
+
+
+def encode_avif(im, quality: int):
+    buf = io.BytesIO()
+    im.save(buf, format="AVIF", quality=quality)
+    return buf.getvalue()
+
+
+FORMATS = {
+    # name: (suffix, encoder(im, args), available)
+    "png8": (".png8.png", lambda im, a: encode_png8(im, a.palette_levels), lambda: True),
+    "webp": (".webp", lambda im, a: encode_webp(im, True, 100), lambda: features.check("webp")),
+    "webp-lossy": (".lossy.webp", lambda im, a: encode_webp(im, False, a.webp_quality), lambda: features.check("webp")),
+    "avif": (".avif", lambda im, a: encode_avif(im, a.avif_quality), lambda: features.check("avif")),
+}
+
+
+def decode_ms(data: bytes, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        with Image.open(io.BytesIO(data)) as im:
+            im.load()
+        times.append(time.perf_counter() - t)
+    return 1000.0 * sum(times) / len(times)
+
+
+def parse_budgets(values):
+    budgets = {}
+    for v in values or []:
+        fmt, _, n = v.rpartition("=")
+        budgets[fmt or "*"] = int(n)
+    return budgets
+
+
+def encode_sprite(path: Path, formats, args):
+    """Write every variant of one sprite; return report rows (name, suffix, bytes, decode_ms)."""
+    src = path.read_bytes()
+    im = Image.open(io.BytesIO(src)).convert("RGBA")
+    rows = [("source", path.suffix, len(src), decode_ms(src))]
+    for name in formats:
+        suffix, enc, available = FORMATS[name]
+        if not available():
+            print(f"WARN: {name} not supported by this Pillow build, skipped")
+            continue
+        data = enc(im, args)
+        (path.parent / (path.stem + suffix)).write_bytes(data)
+        rows.append((name, suffix, len(data), decode_ms(data)))
+    return rows
+
+
+def check_budgets(path: Path, rows, budgets):
+    failures = []
+    for name, _, size, _ in rows:
+        if name == "source":
+            continue
+        limit = budgets.get(name, budgets.get("*"))
+        if limit is not None and size > limit:
+            failures.append(f"{path.name} {name}: {size} bytes > budget {limit}")
+    return failures
+
+
+def palette_levels(value: str) -> int:
+    n = int(value)
+    if not 2 <= n <= 256:
+        raise argparse.ArgumentTypeError(f"must be 2..256, got {n}")
+    return n
+
+
+def add_encode_args(ap):
+    ap.add_argument("--formats", default=",".join(FORMATS), help="Comma-separated: " + ",".join(FORMATS))
+    ap.add_argument("--budget", action="append", help="Max bytes, either N (all formats) or FORMAT=N; repeatable")
+    ap.add_argument("--palette-levels", type=palette_levels, default=256, help="Alpha levels kept in png8 (256 = lossless)")
+    ap.add_argument("--webp-quality", type=int, default=90)
+    ap.add_argument("--avif-quality", type=int, default=80)
+
+
+def run(paths, args):
+    formats = [f for f in args.formats.split(",") if f]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise SystemExit(f"Unknown formats: {', '.join(sorted(unknown))}")
+    budgets = parse_budgets(args.budget)
+    failures = []
+    for path in paths:
+        rows = encode_sprite(Path(path), formats, args)
+        print(f"{path}")
+        for name, suffix, size, ms in rows:
+            print(f"  {name:<11} {size:>9} bytes  decode {ms:7.2f} ms")
+        failures += check_budgets(Path(path), rows, budgets)
+    if failures:
+        raise SystemExit("Byte budget exceeded:\n  " + "\n  ".join(failures))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sprites", nargs="*", help="Sprite PNGs (default: glyph + months sprites)")
+    add_encode_args(ap)
+    args = ap.parse_args()
+    run(args.sprites or DEFAULT_SPRITES, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+fontTools build backend for the clock fonts (no fontforge needed).
+
+Outlines come from the outline store (or a direct content-stream parse when
+the store is missing or stale) as numpy arrays. One exact bbox pass per glyph
+(on-curve points plus cubic extrema) gives a single affine matrix that composes
+scale_to_ascent, baseline_align, center_horiz and tighten from the fontforge
+scripts. The transformed cubics go through cu2qu into glyf, with contours
+reversed to TrueType direction when needed. Overlaps are removed with
+skia-pathops when it is installed (pip install skia-pathops).
+
+eps_glyph() is the per-glyph step shared by the EPS build scripts and the
+matrix sweep; they differ only in the spacing constants they pass. Metrics have
+not been checked against the fontforge builds in this tree (no fontforge here):
+those run removeOverlap() and simplify() before their first boundingBox(), so
+bboxes may differ by simplify()'s error. build_clock_font_from_clean_eps.py
+--compare-backends prints the per-glyph differences where fontforge exists.
+"""
+from __future__ import annotations
+from pathlib import Path
+
+import numpy as np
+
+from outline_store import CLOSE, CURVE, LINE, MOVE, NPTS, draw_outline, parse_eps
+
+CU2QU_MAX_ERR = 1.0  # font units
+
+
+def load_outline(path, store=None):
+    """(cmds, pts float64) for one EPS source, from the store when its entry is fresh."""
+    name = Path(path).stem
+    if store is not None and store.fresh(name, str(path)):
+        cmds, pts = store.outline(name)
+    else:
+        cmds, pts = parse_eps(path)
+    return np.asarray(cmds), np.asarray(pts, dtype=np.float64)
+
+
+def outline_bounds(cmds, pts):
+    """Exact (xmin, ymin, xmax, ymax) of the outline, like fontforge's boundingBox()."""
+    on, p0, ci = [], [], []
+    cur = start = 0
+    i = 0
+    for op in cmds.tolist():
+        if op == MOVE:
+            start = cur = i
+            on.append(i)
+        elif op == LINE:
+            cur = i
+            on.append(i)
+        elif op == CURVE:
+            p0.append(cur)
+            ci.append(i)
+            cur = i + 2
+            on.append(cur)
+        elif op == CLOSE:
+            cur = start
+        i += NPTS[op]
+    cand = [pts[on]]
+    if ci:
+        ci = np.array(ci)
+        P0, P1, P2, P3 = pts[p0], pts[ci], pts[ci + 1], pts[ci + 2]
+        # roots of B'(t)/3 = a t^2 + b t + c, per axis
+        a = -P0 + 3 * P1 - 3 * P2 + P3
+        b = 2 * (P0 - 2 * P1 + P2)
+        c = P1 - P0
+        disc = np.sqrt(np.maximum(b * b - 4 * a * c, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            quad = np.abs(a) > 1e-12
+            t1 = np.where(quad, (-b + disc) / (2 * a), -c / b)
+            t2 = np.where(quad, (-b - disc) / (2 * a), -c / b)
+        for t in (t1, t2):
+            ok = np.isfinite(t) & (t > 0) & (t < 1)
+            t = np.where(ok, t, 0.0)
+            mt = 1 - t
+            v = mt**3 * P0 + 3 * mt**2 * t * P1 + 3 * mt * t**2 * P2 + t**3 * P3
+            cand.append(np.where(ok, v, P0))
+    allp = np.concatenate([c.reshape(-1, 2) for c in cand])
+    return (*allp.min(axis=0), *allp.max(axis=0))
+
+
+def layout_matrix(bbox, adv: float, target_h: float, baseline_pad: float, tighten: float = 0):
+    """Affine (xx, xy, yx, yy, dx, dy) equal to scale_to_ascent -> baseline_align -> center_horiz -> tighten."""
+    x0, y0, x1, y1 = bbox
+    s = target_h / max(1.0, y1 - y0)
+    dy = -s * y0 + baseline_pad
+    dx = (adv - s * (x1 - x0)) / 2.0 - s * x0
+    if tighten > 0:
+        dx -= tighten / 2.0
+    return (s, 0.0, 0.0, s, dx, dy)
+
+
+def apply_affine(pts, m):
+    xx, xy, yx, yy, dx, dy = m
+    return np.column_stack([pts[:, 0] * xx + pts[:, 1] * yx + dx, pts[:, 0] * xy + pts[:, 1] * yy + dy])
+
+
+def place_glyph(cmds, pts, adv: float, target_h: float, baseline_pad: float, tighten: float = 0):
+    """(adv, cmds, pts) with the outline laid out in its advance, like the fontforge scripts' build_glyph()."""
+    m = layout_matrix(outline_bounds(cmds, pts), adv, target_h, baseline_pad, tighten)
+    return adv, cmds, apply_affine(pts, m)
+
+
+def eps_glyph(path, adv: float, target_h: float, baseline_pad: float, tighten: float = 0, store=None):
+    """place_glyph() for one EPS source, rounded on import like g.round() after importOutlines()."""
+    cmds, pts = load_outline(path, store)
+    return place_glyph(cmds, np.round(pts), adv, target_h, baseline_pad, tighten)
+
+
+def glyph_metrics(ttf_path) -> dict:
+    """{codepoint: (advance, xMin, yMin, xMax, yMax)} read back from a TTF."""
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(ttf_path)
+    glyf, hmtx = font["glyf"], font["hmtx"]
+    out = {}
+    for cp, name in font.getBestCmap().items():
+        g = glyf[name]
+        box = (g.xMin, g.yMin, g.xMax, g.yMax) if g.numberOfContours else (0, 0, 0, 0)
+        out[cp] = (hmtx[name][0], *box)
+    return out
+
+
+def signed_area(cmds, pts) -> float:
+    """Shoelace area over all points (control points included); > 0 when outer contours run counter-clockwise."""
+    total, i, sub = 0.0, 0, []
+    for op in cmds.tolist():
+        if op == MOVE:
+            sub = [i]
+        elif op != CLOSE:
+            sub += range(i, i + NPTS[op])
+        else:
+            x, y = pts[sub, 0], pts[sub, 1]
+            total += 0.5 * float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+        i += NPTS[op]
+    return total
+
+
+def tt_glyph(cmds, pts):
+    from fontTools.pens.cu2quPen import Cu2QuPen
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    pen = TTGlyphPen(None)
+    # TrueType wants outer contours clockwise; the EPS sources are PostScript (counter-clockwise)
+    draw_outline(cmds, pts, Cu2QuPen(pen, CU2QU_MAX_ERR, reverse_direction=signed_area(cmds, pts) > 0))
+    return pen.glyph()
+
+
+def build_ttf(glyphs: dict, out_path: str, family: str, em: int, ascent: int, descent: int, notdef_adv: int):
+    """glyphs: {codepoint: (advance, cmds, pts in font units)}; writes a TrueType font."""
+    try:
+        from fontTools.agl import UV2AGL
+        from fontTools.fontBuilder import FontBuilder
+        from fontTools.pens.ttGlyphPen import TTGlyphPen
+    except ImportError:
+        raise SystemExit("ERROR: the fonttools backend needs fontTools (pip install fonttools)")
+
+    names = {cp: UV2AGL.get(cp, f"uni{cp:04X}") for cp in glyphs}
+    ttglyphs = {".notdef": TTGlyphPen(None).glyph()}
+    for cp, (_, cmds, pts) in glyphs.items():
+        ttglyphs[names[cp]] = tt_glyph(cmds, pts)
+
+    fb = FontBuilder(em, isTTF=True)
+    fb.setupGlyphOrder(list(ttglyphs))
+    fb.setupCharacterMap({cp: names[cp] for cp in glyphs})
+    fb.setupGlyf(ttglyphs)
+    glyf = fb.font["glyf"]
+    advances = {".notdef": notdef_adv, **{names[cp]: adv for cp, (adv, _, _) in glyphs.items()}}
+    fb.setupHorizontalMetrics({n: (advances[n], getattr(glyf[n], "xMin", 0)) for n in ttglyphs})
+    fb.setupHorizontalHeader(ascent=ascent, descent=-descent)
+    fb.setupNameTable({"familyName": family, "styleName": "Regular", "psName": family, "fullName": family})
+    fb.setupOS2(sTypoAscender=ascent, sTypoDescender=-descent, sTypoLineGap=0,
+                usWinAscent=ascent, usWinDescent=descent)
+    fb.setupPost()
+
+    try:
+        from fontTools.ttLib.removeOverlaps import removeOverlaps
+        removeOverlaps(fb.font)
+    except ImportError:
+        print("WARN: skia-pathops not installed, overlaps kept (pip install skia-pathops)")
+    fb.save(out_path)
+    return out_path
@@ -0,0 +1,86 @@
+"""
+Content-hash cache for cleaned clock-font outlines.
+
+Each entry is keyed on sha256(source file bytes + build constants) and stores
+the glyph's final contours (after import, cleanup, scale, align and tighten),
+so a rebuild only re-imports and re-cleans glyphs whose source or constants
+changed. One small JSON file per glyph lives under the cache directory.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+
+CACHE_VERSION = 1
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class GlyphCache:
+    def __init__(self, cache_dir: str, params: dict):
+        self.cache_dir = cache_dir
+        self.params = dict(params)
+        self._params_blob = json.dumps(
+            {"version": CACHE_VERSION, "params": self.params}, sort_keys=True
+        ).encode("utf-8")
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, src_path: str) -> str:
+        h = hashlib.sha256(self._params_blob)
+        h.update(file_digest(src_path).encode("ascii"))
+        return h.hexdigest()
+
+    def _entry_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def get(self, name: str, src_path: str):
+        path = self._entry_path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != self.key(src_path):
+            return None
+        return entry["contours"]
+
+    def put(self, name: str, src_path: str, contours: list):
+        entry = {"key": self.key(src_path), "source": src_path, "contours": contours}
+        tmp = self._entry_path(name) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh, separators=(",", ":"))
+        os.replace(tmp, self._entry_path(name))
+
+
+def layer_to_contours(layer) -> list:
+    """Serialize a fontforge layer as [{"closed", "quadratic", "points": [[x, y, on], ...]}]."""
+    out = []
+    for c in layer:
+        out.append({
+            "closed": bool(c.closed),
+            "quadratic": bool(c.is_quadratic),
+            "points": [[p.x, p.y, 1 if p.on_curve else 0] for p in c],
+        })
+    return out
+
+
+def contours_to_layer(contours: list):
+    import fontforge
+
+    layer = fontforge.layer()
+    for cd in contours:
+        c = fontforge.contour()
+        c.is_quadratic = cd["quadratic"]
+        for x, y, on in cd["points"]:
+            c += fontforge.point(x, y, bool(on))
+        c.closed = cd["closed"]
+        layer += c
+    return layer
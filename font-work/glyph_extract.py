@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Shared glyph extraction for the numbers and months sheets.
+
+The ink mask is labeled once. Bounding boxes come from find_objects, and each
+component's area and centroid are read from its own bbox view of the label
+image, so the sheet is never rescanned per component or per cell. A glyph
+drawn as several pieces (the counters and dots of a month name) is merged by
+assigning every component to the grid cell that holds its centroid. A cell is
+then cut out as a view of the sheet, with the ink of other cells masked off
+by label.
+
+Used by graffiti_numbers_cleaned_pack/make_graffiti_numbers_clean.py (glyph
+groups) and graffiti_months_cleaned_pack/make_graffiti_months_clean.py.
+
+Dependencies: numpy, scipy
+"""
+from __future__ import annotations
+
+import numpy as np
+from scipy import ndimage
+
+
+def label_components(mask: np.ndarray, structure=None):
+    """One labeling pass: (lbl, n, objects, areas (n+1,), centroids (n+1, 2) as (y, x)).
+
+    Area and centroid of each component are read from its find_objects view.
+    """
+    lbl, n = ndimage.label(mask, structure=structure)
+    objects = ndimage.find_objects(lbl)
+    areas = np.zeros(n+1, np.int64)
+    centroids = np.zeros((n+1, 2))
+    for i, sl in enumerate(objects, start=1):
+        if sl is None:
+            continue
+        ys, xs = np.nonzero(lbl[sl] == i)
+        areas[i] = ys.size
+        centroids[i] = (sl[0].start + ys.mean(), sl[1].start + xs.mean())
+    return lbl, n, objects, areas, centroids
+
+
+def components(mask: np.ndarray, structure=None):
+    """label_components() as (n, [(label, x0,y0,x1,y1, area), ...]) with exclusive x1/y1, in label order."""
+    _, n, objects, areas, _ = label_components(mask, structure)
+    boxes = [(i, sl[1].start, sl[0].start, sl[1].stop, sl[0].stop, int(areas[i]))
+             for i, sl in enumerate(objects, start=1) if sl is not None]
+    return n, boxes
+
+
+def grid_cells(shape, objects, areas, centroids, cols: int, rows: int, min_area: int = 0):
+    """Merge components by the grid cell of their centroid.
+
+    Returns {(r, c): {"labels": [...], "bbox": (x0,y0,x1,y1)}} with exclusive
+    x1/y1; components smaller than min_area are dropped, empty cells left out.
+    """
+    H, W = shape
+    cells = {}
+    for i, sl in enumerate(objects, start=1):
+        if sl is None or areas[i] < min_area:
+            continue
+        cy, cx = centroids[i]
+        rc = (min(rows-1, int(cy * rows // H)), min(cols-1, int(cx * cols // W)))
+        box = (sl[1].start, sl[0].start, sl[1].stop, sl[0].stop)
+        cell = cells.setdefault(rc, {"labels": [], "bbox": box})
+        cell["labels"].append(i)
+        b = cell["bbox"]
+        cell["bbox"] = (min(b[0], box[0]), min(b[1], box[1]), max(b[2], box[2]), max(b[3], box[3]))
+    return cells
+
+
+def cell_window(bbox, shape, pad: int = 0):
+    """(slice y, slice x) of a bbox grown by pad and clipped to the sheet."""
+    x0, y0, x1, y1 = bbox
+    H, W = shape[:2]
+    return slice(max(0, y0-pad), min(H, y1+pad)), slice(max(0, x0-pad), min(W, x1+pad))
+
+
+def cell_pixels(img: np.ndarray, lbl: np.ndarray, labels, window):
+    """Copy of img[window] with pixels of any other component zeroed (alpha too, for RGBA)."""
+    out = np.array(img[window])
+    out[~np.isin(lbl[window], labels) & (lbl[window] > 0)] = 0
+    return out
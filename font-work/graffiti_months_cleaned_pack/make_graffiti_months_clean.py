@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Cut the cleaned months sheet (MONTHS_SHEET_clean.png, white ink on transparent,
+4x3 grid JAN..DEC) into per-month transparent PNGs plus qc.json.
+
+- Labels the ink (alpha > --alpha-thr) once; see font-work/glyph_extract.py.
+- Merges each month's pieces (letters, counters, dots) by the grid cell of
+  their centroid, so no fixed slicing and no per-month re-labeling.
+- Crops each month's bbox plus --pad from the sheet; ink belonging to other
+  months inside the crop is cleared.
+- Outputs:
+  - <MONTH>.png (RGBA crop)
+  - qc.json: image_size, and per month grid_rc, raw_component_labels,
+    bbox_xyxy (inclusive, padded), crop_size, nonzero_alpha
+
+A sheet without an alpha channel is read as light ink on a dark background:
+its luma becomes the alpha of white ink.
+
+Usage:
+  python3 make_graffiti_months_clean.py --in MONTHS_SHEET_clean.png --out graffiti_months_cleaned_pack
+
+Dependencies: pillow, numpy, scipy
+"""
+from __future__ import annotations
+import argparse, json, sys, time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from glyph_extract import cell_pixels, cell_window, grid_cells, label_components
+
+MONTHS = ["JAN","FEB","MAR","APR","MAY","JUN","JUL","AUG","SEP","OCT","NOV","DEC"]
+GRID = (4, 3)  # cols, rows
+PAD = 16
+
+
+def sheet_rgba(im: Image.Image):
+    """(H,W,4) uint8; a sheet without alpha becomes white ink with its luma as alpha."""
+    if "A" in im.getbands():
+        return np.asarray(im.convert("RGBA"))
+    rgba = np.full((im.size[1], im.size[0], 4), 255, np.uint8)
+    rgba[..., 3] = np.asarray(im.convert("L"))
+    return rgba
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in", dest="inp", required=True, help="Input months sheet PNG")
+    ap.add_argument("--out", dest="out", required=True, help="Output directory")
+    ap.add_argument("--pad", type=int, default=PAD, help=f"Pixels kept around each month (default: {PAD})")
+    ap.add_argument("--alpha-thr", type=int, default=0, help="Alpha (or luma) above this is ink (default: 0)")
+    ap.add_argument("--min-area", type=int, default=0, help="Ignore components smaller than this (default: 0)")
+    args = ap.parse_args()
+
+    t = time.perf_counter()
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    im = Image.open(args.inp)
+    rgba = sheet_rgba(im)
+    mask = rgba[..., 3] > args.alpha_thr
+    lbl, n, objects, areas, centroids = label_components(mask)
+    cols, rows = GRID
+    cells = grid_cells(mask.shape, objects, areas, centroids, cols, rows, args.min_area)
+    missing = [m for i, m in enumerate(MONTHS) if divmod(i, cols) not in cells]
+    if missing:
+        raise SystemExit(f"No ink in the grid cells of: {', '.join(missing)} ({n} components)")
+
+    qc = {"image_size": list(im.size), "cells": {}}
+    for i, month in enumerate(MONTHS):
+        rc = divmod(i, cols)
+        cell = cells[rc]
+        ys, xs = cell_window(cell["bbox"], mask.shape, args.pad)
+        crop = cell_pixels(rgba, lbl, cell["labels"], (ys, xs))
+        Image.fromarray(crop, "RGBA").save(out/f"{month}.png")
+        qc["cells"][month] = {
+            "grid_rc": list(rc),
+            "raw_component_labels": cell["labels"],
+            "bbox_xyxy": [xs.start, ys.start, xs.stop-1, ys.stop-1],
+            "crop_size": [xs.stop-xs.start, ys.stop-ys.start],
+            "nonzero_alpha": int((crop[..., 3] > 0).sum()),
+        }
+    (out/"qc.json").write_text(json.dumps(qc, indent=2), encoding="utf-8")
+    print(f"Wrote {len(MONTHS)} months from {n} components in {time.perf_counter() - t:.2f}s -> {out}")
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ with a "clean" (solid stroke) set and a separate "shadow" set.
 
 Key properties:
 - Does NOT do naive equal-square slicing.
-- Finds glyph groups by background-subtracted line mask + dilation, then connected components.
+- Finds glyph groups by background-subtracted line mask + dilation, then connected components
+  (one labeling pass, font-work/glyph_extract.py, shared with the months pack).
 - Cleans stroke with morphology (opening/closing) and slight dilation to make lines solid.
 - Outputs:
   - tight_clean/*.png (tight-cropped glyphs, transparent)
@@ -13,39 +14,310 @@ Key properties:
   - aligned_clean_1024/*.png (baseline-centered, 1024x1024 transparent)
   - aligned_shadow_1024/*_shadow.png
   - previews/*.png (sheets on dark/white)
-  - qc_numbers.json (bbox mapping + border-alpha checks)
+  - qc_numbers.json (bbox mapping + border-alpha checks + per-stage timings)
+  - <out>.zip (all of the above, reproducible)
 
 Usage:
   python3 make_graffiti_numbers_clean.py --in GRAFFITI_FAT_NUMBERS.png --out graffiti_numbers_clean
+  python3 make_graffiti_numbers_clean.py --in new_sheets/ --out packs --jobs 4
+
+The detection, sweep and batch modes are described in --help and SPRITE_RUNBOOK.md.
 
 Dependencies: pillow, numpy, scipy
 """
 from __future__ import annotations
-import argparse, json, math, os, zipfile
+import argparse, atexit, hashlib, io, itertools, json, math, os, shutil, sys, tempfile, time, zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from multiprocessing import shared_memory
 from pathlib import Path
 
 import numpy as np
-from PIL import Image, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
 from scipy import ndimage
+from scipy.optimize import linear_sum_assignment
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from glyph_extract import cell_window, components
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(rss if sys.platform == "darwin" else rss * 1024)
+
+
+class StageTimer:
+    """Collects wall time, CPU time and peak RSS per stage, across worker processes."""
+
+    def __init__(self):
+        self.t0 = time.time()
+        self.events = []
+
+    @contextmanager
+    def stage(self, name: str, **args):
+        start = time.time()
+        w0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.events.append({
+                "name": name, "start": start, "wall": time.perf_counter() - w0,
+                "cpu": time.process_time() - c0, "peak_rss": peak_rss_bytes(),
+                "pid": os.getpid(), "args": args,
+            })
+
+    def report(self):
+        totals = {}
+        for e in self.events:
+            t = totals.setdefault(e["name"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_rss_bytes": None})
+            t["calls"] += 1
+            t["wall_s"] += e["wall"]
+            t["cpu_s"] += e["cpu"]
+            if e["peak_rss"] is not None:
+                t["peak_rss_bytes"] = max(t["peak_rss_bytes"] or 0, e["peak_rss"])
+        stages = [{"name": e["name"], **e["args"], "start_s": round(e["start"] - self.t0, 6),
+                   "wall_s": round(e["wall"], 6), "cpu_s": round(e["cpu"], 6),
+                   "peak_rss_bytes": e["peak_rss"], "pid": e["pid"]} for e in self.events]
+        return {"totals": totals, "stages": stages}
+
+    def chrome_trace(self):
+        return {"traceEvents": [{
+            "name": e["name"], "cat": "stage", "ph": "X", "pid": e["pid"], "tid": e["pid"],
+            "ts": int((e["start"] - self.t0) * 1e6), "dur": max(1, int(e["wall"] * 1e6)),
+            "args": {**e["args"], "cpu_s": e["cpu"], "peak_rss_bytes": e["peak_rss"]},
+        } for e in self.events], "displayTimeUnit": "ms"}
+
+
+SHEET_BLUR_SIGMA = 8
+SHEET_LINE_THR = 10.0
+GROUP_RADIUS = 25
+PYRAMID_SLACK = 0.5  # grey levels of leeway for the block-mean blur in the pyramid candidate test
+
+
+def sheet_line_mask(gray: np.ndarray, sigma:float=SHEET_BLUR_SIGMA, thr:float=SHEET_LINE_THR):
+    """Background-subtracted line mask: pixels brighter than their blurred surroundings."""
+    gray = np.asarray(gray, dtype=np.float32)
+    diff = gray - ndimage.gaussian_filter(gray, sigma=sigma)
+    return diff > thr
+
+
+def group_mask_dilate(mask_line: np.ndarray, radius:int=GROUP_RADIUS):
+    return ndimage.binary_dilation(mask_line, iterations=radius)
+
+
+def group_mask_distance(mask_line: np.ndarray, radius:int=GROUP_RADIUS):
+    # Iterating binary_dilation with the default cross structure grows the mask by an
+    # L1 diamond, so the result is exactly the pixels within taxicab distance `radius`.
+    if not mask_line.any():
+        return np.zeros_like(mask_line)
+    dist = ndimage.distance_transform_cdt(~mask_line, metric="taxicab")
+    return dist <= radius
+
+
+GROUP_ENGINES = {"dilate": group_mask_dilate, "distance": group_mask_distance}
+
+
+def find_glyph_groups(mask_line: np.ndarray, engine:str="dilate", radius:int=GROUP_RADIUS, timer=None):
+    """Merge line pixels into glyph groups; return (n, [(label, x0,y0,x1,y1, area), ...])."""
+    timer = timer or StageTimer()
+    with timer.stage("dilation", engine=engine):
+        group_mask = GROUP_ENGINES[engine](mask_line, radius)
+    with timer.stage("labeling"):
+        return components(group_mask)
+
+
+def find_glyph_groups_pyramid(gray: np.ndarray, factor:int=4, engine:str="dilate", radius:int=GROUP_RADIUS,
+                              sigma:float=SHEET_BLUR_SIGMA, thr:float=SHEET_LINE_THR):
+    """Coarse-to-fine equivalent of find_glyph_groups(sheet_line_mask(gray)).
+
+    The sigma-8 blur is computed on a block-mean copy (factor x smaller each way). A
+    block is a candidate when its brightest full-res pixel clears thr against that blur,
+    less the blur's range over the neighbouring blocks (the most the full-res blur can
+    differ inside the block) and PYRAMID_SLACK. Flat background thus needs the full
+    threshold, while blocks on a stroke edge are kept. Coarse groups only pick windows;
+    every returned bbox/area comes from a full-resolution pass over its window plus a
+    halo, so results are exact whenever each group has a candidate pixel.
+    """
+    H,W = gray.shape
+    wc = -(-W // factor)
+    strip = 256 * factor
+
+    pooled, peak = [], []
+    for y0 in range(0, H, strip):
+        g = np.asarray(gray[y0:y0+strip], dtype=np.float32)
+        g = np.pad(g, ((0, -g.shape[0] % factor), (0, wc*factor - W)), mode="edge")
+        g = g.reshape(g.shape[0]//factor, factor, wc, factor)
+        pooled.append(g.mean(axis=(1,3)))
+        peak.append(g.max(axis=(1,3)))
+    coarse_blur = ndimage.gaussian_filter(np.concatenate(pooled), sigma=sigma/factor)
+    spread = ndimage.maximum_filter(coarse_blur, 3) - ndimage.minimum_filter(coarse_blur, 3)
+    cand = np.concatenate(peak) - coarse_blur > thr - spread - PYRAMID_SLACK
+    coarse = GROUP_ENGINES[engine](cand, int(math.ceil(radius/factor)) + 1)
+    clbl, _ = ndimage.label(coarse)
+
+    # Every full-res group lies inside one coarse component (the coarse radius covers
+    # the merge radius from anywhere in a block), so each component is refined once,
+    # restricted to its own blocks: neighbouring groups never leak into its window.
+    halo = int(4.0 * sigma + 0.5) + radius + 1
+    found = {}  # first raster index -> [x0, y0, x1, y1, area]
+    for i, (ys, xs) in enumerate(ndimage.find_objects(clbl), start=1):
+        wy0, wx0 = ys.start*factor, xs.start*factor
+        wy1, wx1 = min(H, ys.stop*factor), min(W, xs.stop*factor)
+        ry0, rx0 = max(0, wy0-halo), max(0, wx0-halo)
+        ry1, rx1 = min(H, wy1+halo), min(W, wx1+halo)
+        mask = sheet_line_mask(gray[ry0:ry1, rx0:rx1], sigma=sigma, thr=thr)
+        own = (clbl[ys, xs] == i).repeat(factor, axis=0).repeat(factor, axis=1)[:wy1-wy0, :wx1-wx0]
+        win = GROUP_ENGINES[engine](mask, radius)[wy0-ry0:wy1-ry0, wx0-rx0:wx1-rx0] & own
+
+        lbl, k = ndimage.label(win)
+        areas = np.bincount(lbl.ravel(), minlength=k+1)
+        for l, (ly, lx) in enumerate(ndimage.find_objects(lbl), start=1):
+            fx = lx.start + int(np.argmax(lbl[ly.start, lx] == l))
+            found[(wy0+ly.start)*W + wx0+fx] = [wx0+lx.start, wy0+ly.start, wx0+lx.stop, wy0+ly.stop, int(areas[l])]
+
+    ordered = [found[k] for k in sorted(found)]
+    bboxes = [(i, x0,y0,x1,y1, area) for i,(x0,y0,x1,y1,area) in enumerate(ordered, start=1)]
+    return len(bboxes), bboxes
+
+
+def decode_sheet_memmap(inp: Path, work_dir: Path, strip:int=512):
+    """Decode the sheet into on-disk (H,W,3) RGB and (H,W) gray uint8 .npy memmaps.
+
+    PIL still inflates the PNG in one piece; everything downstream reads strips/tiles.
+    """
+    with Image.open(inp) as im:
+        if im.mode != "RGB":
+            im = im.convert("RGB")
+        W,H = im.size
+        rgb = np.lib.format.open_memmap(work_dir/"sheet_rgb.npy", mode="w+", dtype=np.uint8, shape=(H,W,3))
+        gray = np.lib.format.open_memmap(work_dir/"sheet_gray.npy", mode="w+", dtype=np.uint8, shape=(H,W))
+        for y in range(0, H, strip):
+            part = im.crop((0, y, W, min(H, y+strip)))
+            rgb[y:y+part.size[1]] = np.asarray(part)
+            gray[y:y+part.size[1]] = np.asarray(part.convert("L"))
+    rgb.flush(); gray.flush()
+    return rgb, gray
+
+
+def find_glyph_groups_tiled(gray: np.ndarray, tile:int, engine:str="dilate", radius:int=GROUP_RADIUS,
+                            sigma:float=SHEET_BLUR_SIGMA, thr:float=SHEET_LINE_THR):
+    """Tile-by-tile equivalent of find_glyph_groups(sheet_line_mask(gray)).
+
+    Each tile is read with a halo covering the blur kernel plus the merge radius, so
+    the group mask is exact in the tile core. Core components are labeled per tile and
+    joined across seams with union-find; groups are then numbered by their first pixel
+    in raster order, which reproduces ndimage.label's numbering on the full sheet.
+    Peak memory is a few float32 tiles regardless of sheet size.
+    """
+    H,W = gray.shape
+    halo = int(4.0 * sigma + 0.5) + radius + 1
+    parent = []
+    comps = []  # per component: [x0, y0, x1, y1, area, first_raster_index]
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
 
+    def join(edge_a, edge_b):
+        both = (edge_a >= 0) & (edge_b >= 0)
+        for a, b in set(zip(edge_a[both].tolist(), edge_b[both].tolist())):
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra,rb)] = min(ra,rb)
 
-def extract_crop(im_rgb: Image.Image, x0:int, y0:int, x1:int, y1:int, pad:int=30):
-    W,H = im_rgb.size
-    x0=max(0,x0-pad); y0=max(0,y0-pad); x1=min(W,x1+pad); y1=min(H,y1+pad)
-    return im_rgb.crop((x0,y0,x1,y1))
+    above = {}  # tile x -> global ids along the bottom row of the tile above
+    for ty in range(0, H, tile):
+        left = None
+        for tx in range(0, W, tile):
+            ty1, tx1 = min(H, ty+tile), min(W, tx+tile)
+            py0, px0 = max(0, ty-halo), max(0, tx-halo)
+            py1, px1 = min(H, ty1+halo), min(W, tx1+halo)
+            mask = sheet_line_mask(gray[py0:py1, px0:px1], sigma=sigma, thr=thr)
+            core = GROUP_ENGINES[engine](mask, radius)[ty-py0:ty1-py0, tx-px0:tx1-px0]
+            lbl, k = ndimage.label(core)
+
+            base = len(comps)
+            gid = np.concatenate([[-1], np.arange(base, base+k)])
+            areas = np.bincount(lbl.ravel(), minlength=k+1)
+            for l, (ys, xs) in enumerate(ndimage.find_objects(lbl), start=1):
+                fx = xs.start + int(np.argmax(lbl[ys.start, xs] == l))
+                comps.append([tx+xs.start, ty+ys.start, tx+xs.stop, ty+ys.stop,
+                              int(areas[l]), (ty+ys.start)*W + tx+fx])
+                parent.append(base + l - 1)
+
+            if tx in above:
+                join(gid[lbl[0]], above[tx])
+            if left is not None:
+                join(gid[lbl[:,0]], left)
+            above[tx] = gid[lbl[-1]]
+            left = gid[lbl[:,-1]]
+
+    merged = {}
+    for i, c in enumerate(comps):
+        r = find(i)
+        if r not in merged:
+            merged[r] = list(c)
+        else:
+            m = merged[r]
+            m[0] = min(m[0], c[0]); m[1] = min(m[1], c[1])
+            m[2] = max(m[2], c[2]); m[3] = max(m[3], c[3])
+            m[4] += c[4]; m[5] = min(m[5], c[5])
+    ordered = sorted(merged.values(), key=lambda m: m[5])
+    bboxes = [(i, x0,y0,x1,y1, area) for i,(x0,y0,x1,y1,area,_) in enumerate(ordered, start=1)]
+    return len(bboxes), bboxes
+
+
+def extract_crop_array(sheet: np.ndarray, x0:int, y0:int, x1:int, y1:int, pad:int=30):
+    """RGB crop of the bbox grown by pad (clipped to the sheet); copies only the crop from the (H,W,3) array."""
+    return Image.fromarray(np.ascontiguousarray(sheet[cell_window((x0,y0,x1,y1), sheet.shape, pad)]))
+
+
+class CropMasks:
+    """clean_mask_from_crop() of one crop under many settings.
+
+    Every step (blur, threshold, opening, closing, dilation) is cached by the
+    settings that lead up to it, so each distinct blur is computed once and
+    settings sharing a prefix of the chain share its arrays.
+    """
+
+    def __init__(self, crop_rgb: Image.Image):
+        self.gray = np.array(crop_rgb.convert("L")).astype(np.float32)
+        self._cache = {}
+
+    def _step(self, key, make):
+        if key not in self._cache:
+            self._cache[key] = make()
+        return self._cache[key]
+
+    def line_mask(self, blur_sigma:float=6, diff_thr:float=8):
+        """The thresholded difference image, before any morphology."""
+        d = self._step((blur_sigma,), lambda: self.gray - ndimage.gaussian_filter(self.gray, sigma=blur_sigma))
+        return self._step((blur_sigma, diff_thr), lambda: d > diff_thr)
+
+    def mask(self, blur_sigma:float=6, diff_thr:float=8, open_iter:int=1, close_iter:int=2, dil_iter:int=1):
+        m = self.line_mask(blur_sigma, diff_thr)
+        key = (blur_sigma, diff_thr, open_iter)
+        m = self._step(key, lambda: ndimage.binary_opening(m, iterations=open_iter))
+        key += (close_iter,)
+        m = self._step(key, lambda: ndimage.binary_closing(m, iterations=close_iter))
+        if dil_iter > 0:
+            m = self._step(key + (dil_iter,), lambda: ndimage.binary_dilation(m, iterations=dil_iter))
+        return m
 
 
 def clean_mask_from_crop(crop_rgb: Image.Image, blur_sigma:float=6, diff_thr:float=8,
                          open_iter:int=1, close_iter:int=2, dil_iter:int=1):
-    g = np.array(crop_rgb.convert("L")).astype(np.float32)
-    blur = ndimage.gaussian_filter(g, sigma=blur_sigma)
-    d = g - blur
-    m = d > diff_thr
-    m = ndimage.binary_opening(m, iterations=open_iter)
-    m = ndimage.binary_closing(m, iterations=close_iter)
-    if dil_iter > 0:
-        m = ndimage.binary_dilation(m, iterations=dil_iter)
-    return m
+    return CropMasks(crop_rgb).mask(blur_sigma, diff_thr, open_iter, close_iter, dil_iter)
 
 
 def rgba_from_mask(crop_rgb: Image.Image, mask: np.ndarray, alpha_blur:float=0.6, color=(255,255,255)):
@@ -78,16 +350,60 @@ def tight_crop_rgba(rgba: Image.Image, pad:int=10):
     return rgba.crop((x0,y0,x1,y1))
 
 
+@lru_cache(maxsize=None)
+def _opacity_lut(opacity:int):
+    """Alpha -> shadow alpha table, the same float32 scale-and-truncate as per pixel."""
+    return (np.arange(256, dtype=np.float32) * (opacity/255.0)).clip(0,255).astype(np.uint8).tolist()
+
+
+class ShadowEngine:
+    """Drop shadows from a cached, bbox-limited blur of each image's alpha.
+
+    PIL's GaussianBlur is three box passes per axis clamped at the image edge, so
+    the blur of the alpha bbox plus 3*(radius+1) px is identical to blurring the
+    whole image; only that window is blurred. Blurred windows are cached by the
+    alpha's content (size, bbox and a digest of the bbox bytes) and the blur, so
+    variants with other offsets or opacities reuse them and one engine can serve
+    any number of images. The shadow is built in one L layer and composited once.
+    """
+
+    def __init__(self):
+        self._blurred = {}
+
+    def blurred_alpha(self, rgba: Image.Image, blur:float):
+        """(blurred alpha window as L image, (x, y) of the window) or None for an empty alpha."""
+        a = rgba.getchannel("A")
+        bb = a.getbbox()
+        if bb is None:
+            return None
+        key = (rgba.size, bb, hashlib.blake2b(a.crop(bb).tobytes(), digest_size=16).digest(), blur)
+        if key not in self._blurred:
+            pad = 3 * (int(math.ceil(blur)) + 1)
+            W,H = rgba.size
+            x0,y0 = max(0, bb[0]-pad), max(0, bb[1]-pad)
+            window = a.crop((x0, y0, min(W, bb[2]+pad), min(H, bb[3]+pad)))
+            self._blurred[key] = window.filter(ImageFilter.GaussianBlur(radius=blur)), (x0, y0)
+        return self._blurred[key]
+
+    def render(self, rgba: Image.Image, dx:int=14, dy:int=14, blur:float=8, opacity:int=180):
+        """Same pixels as the original add_shadow_rgba(rgba, dx, dy, blur, opacity)."""
+        found = self.blurred_alpha(rgba, blur)
+        if found is None:
+            return rgba.copy()
+        window, (x0, y0) = found
+        sh_alpha = Image.new("L", rgba.size, 0)
+        sh_alpha.paste(window.point(_opacity_lut(opacity)), (x0+dx, y0+dy))
+        sh = Image.new("RGBA", rgba.size, (0,0,0,0))
+        sh.putalpha(sh_alpha)
+        return Image.alpha_composite(sh, rgba)
+
+    def variants(self, rgba: Image.Image, specs):
+        """One shadowed image per (dx, dy, blur, opacity); each blur radius is computed once."""
+        return [self.render(rgba, dx, dy, blur, opacity) for dx, dy, blur, opacity in specs]
+
+
 def add_shadow_rgba(rgba: Image.Image, dx:int=14, dy:int=14, blur:int=8, opacity:int=180):
-    a = rgba.split()[-1]
-    sh = a.filter(ImageFilter.GaussianBlur(radius=blur))
-    sh_arr = (np.array(sh, dtype=np.float32) * (opacity/255.0)).clip(0,255).astype(np.uint8)
-    sh_img = Image.new("RGBA", rgba.size, (0,0,0,0))
-    sh_img.putalpha(Image.fromarray(sh_arr))
-    base = Image.new("RGBA", rgba.size, (0,0,0,0))
-    base.alpha_composite(sh_img, (dx,dy))
-    base.alpha_composite(rgba, (0,0))
-    return base
+    return ShadowEngine().render(rgba, dx, dy, blur, opacity)
 
 
 def composite_on_bg(rgba: Image.Image, bg=(15,15,15)):
@@ -119,8 +435,16 @@ def aligned_canvas(rgba_tight: Image.Image, canvas:int=1024, baseline_y:int=960,
     return out, {"scale":float(scale),"paste_x":int(paste_x),"paste_y":int(paste_y),"bbox_h":int(bb_h)}
 
 
-def make_sheet(img_paths, cols:int, bg=(15,15,15), out_path:Path|None=None):
-    imgs = [Image.open(p).convert("RGBA") for p in img_paths]
+def encode_png(img: Image.Image) -> bytes:
+    """PNG bytes exactly as img.save(path) writes them."""
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def make_sheet(imgs, cols:int, bg=(15,15,15), out_path:Path|None=None):
+    """Preview grid from RGBA images (or paths, which are opened)."""
+    imgs = [img if isinstance(img, Image.Image) else Image.open(img).convert("RGBA") for img in imgs]
     w,h = imgs[0].size
     rows = math.ceil(len(imgs)/cols)
     sheet = Image.new("RGB", (w*cols, h*rows), bg)
@@ -133,6 +457,140 @@ def make_sheet(img_paths, cols:int, bg=(15,15,15), out_path:Path|None=None):
     return sheet
 
 
+def process_glyph(sheet: np.ndarray, name: str, bbox, timer=None):
+    """Run cleanup -> shadows -> alignment -> PNG encodes for one glyph.
+
+    Returns {"metrics": QC metrics, "files": {path under --out: PNG bytes},
+    "aligned": aligned RGBA, "sh_aligned": its shadow version}; nothing is written here.
+    """
+    timer = timer or StageTimer()
+    x0,y0,x1,y1 = bbox
+    with timer.stage("cleanup", glyph=name):
+        crop = extract_crop_array(sheet, x0,y0,x1,y1, pad=30)
+        mask = clean_mask_from_crop(crop, blur_sigma=6, diff_thr=8, open_iter=1, close_iter=2, dil_iter=1)
+        rgba = rgba_from_mask(crop, mask, alpha_blur=0.6)
+        tight = tight_crop_rgba(rgba, pad=10)
+    with timer.stage("alignment", glyph=name):
+        aligned, am = aligned_canvas(tight, canvas=1024, baseline_y=960, target_h=860)
+    with timer.stage("shadow", glyph=name):
+        shadows = ShadowEngine()
+        sh_tight = shadows.render(tight, dx=14, dy=14, blur=8, opacity=180)
+        sh_aligned = shadows.render(aligned, dx=20, dy=20, blur=12, opacity=160)
+
+    with timer.stage("png_encode", glyph=name):
+        files = {
+            f"tight_clean/{name}.png": encode_png(tight),
+            f"tight_shadow/{name}_shadow.png": encode_png(sh_tight),
+            f"aligned_clean_1024/{name}.png": encode_png(aligned),
+            f"aligned_shadow_1024/{name}_shadow.png": encode_png(sh_aligned),
+            # quick previews
+            f"previews/{name}_tight_dark.png": encode_png(composite_on_bg(tight, bg=(12,12,12))),
+            f"previews/{name}_tight_white.png": encode_png(composite_on_bg(tight, bg=(245,245,245))),
+        }
+
+    # QC: border alpha check on aligned
+    a = np.array(aligned.split()[-1])
+    border = np.concatenate([a[0,:], a[-1,:], a[:,0], a[:,-1]])
+    metrics = {"align": am, "aligned_border_alpha_max": int(border.max())}
+    return {"metrics": metrics, "files": files, "aligned": aligned, "sh_aligned": sh_aligned}
+
+
+# Worker-side view of the decoded sheet, attached once per process by _attach_sheet.
+_WORKER_SHM = None
+_WORKER_SHEET = None
+
+
+def _attach_sheet(kind: str, ref: str, shape):
+    global _WORKER_SHM, _WORKER_SHEET
+    if kind == "npy":
+        _WORKER_SHEET = np.load(ref, mmap_mode="r")
+        return
+    _WORKER_SHM = shared_memory.SharedMemory(name=ref)
+    _WORKER_SHEET = np.ndarray(shape, dtype=np.uint8, buffer=_WORKER_SHM.buf)
+
+
+def _glyph_task(name: str, bbox):
+    timer = StageTimer()
+    result = process_glyph(_WORKER_SHEET, name, bbox, timer=timer)
+    return result, timer.events
+
+
+def process_glyphs(sheet: np.ndarray, glyph_jobs, workers:int=1, timer=None):
+    """Yield (name, process_glyph() result) for every (name, bbox) in glyph_jobs, in input order
+    for any worker count, as soon as each is available."""
+    timer = timer or StageTimer()
+    if workers <= 1:
+        for name, bbox in glyph_jobs:
+            yield name, process_glyph(sheet, name, bbox, timer=timer)
+        return
+
+    # Memmapped sheets (--tile) are reopened by path; in-memory sheets go through shared memory.
+    shm = None
+    if isinstance(sheet, np.memmap) and sheet.filename:
+        initargs = ("npy", str(sheet.filename), sheet.shape)
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=sheet.nbytes)
+        np.ndarray(sheet.shape, dtype=np.uint8, buffer=shm.buf)[...] = sheet
+        initargs = ("shm", shm.name, sheet.shape)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_sheet, initargs=initargs) as ex:
+            futures = [(name, ex.submit(_glyph_task, name, bbox)) for name, bbox in glyph_jobs]
+            for name, fut in futures:
+                result, events = fut.result()
+                timer.events.extend(events)
+                yield name, result
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+
+class ZipPackager:
+    """Reproducible zip written entry by entry as outputs are produced.
+
+    Every entry is written, so a plain unzip restores all files. Already
+    compressed payloads (PNG etc.) are stored, everything else is deflated.
+    Timestamps, permissions and entry order are fixed, so unchanged inputs
+    give a byte-identical archive.
+
+    Identical payloads are not deduplicated: a zip entry cannot point at
+    another entry's data, so omitting one loses the file on unzip. Caching
+    the compressed bytes by hash would not help either, since the stored
+    PNGs cost no compression and the deflated JSON is a few small files.
+    """
+    DATE_TIME = (1980, 1, 1, 0, 0, 0)
+    STORED_SUFFIXES = {".png", ".webp", ".avif", ".jpg", ".woff2", ".zip"}
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._zip = zipfile.ZipFile(self._tmp, "w")
+
+    def add(self, name: str, data: bytes):
+        info = zipfile.ZipInfo(name, date_time=self.DATE_TIME)
+        info.create_system = 3  # unix, so external_attr means the same everywhere
+        info.external_attr = 0o644 << 16
+        if Path(name).suffix.lower() in self.STORED_SUFFIXES:
+            info.compress_type = zipfile.ZIP_STORED
+        else:
+            info.compress_type = zipfile.ZIP_DEFLATED
+        self._zip.writestr(info, data, compresslevel=9 if info.compress_type == zipfile.ZIP_DEFLATED else None)
+
+    def close(self):
+        self._zip.close()
+        self._tmp.replace(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
+            self._tmp.unlink(missing_ok=True)
+
+
 def to_builtin(obj):
     if isinstance(obj, dict):
         return {str(k): to_builtin(v) for k,v in obj.items()}
@@ -145,39 +603,267 @@ def to_builtin(obj):
     return obj
 
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--in", dest="inp", required=True, help="Input numbers sheet PNG")
-    ap.add_argument("--out", dest="out", required=True, help="Output directory")
-    args = ap.parse_args()
+# This sheet contains duplicates for 6 and 7 (bottom row). Export them as *_alt too.
+# Mapping verified visually against the provided sheet.
+ID_MAP = {"0":3,"1":2,"2":1,"3":4,"4":7,"5":8,"6":5,"7":6,"6_alt":9,"7_alt":10,"8":11,"9":12}
 
-    inp = Path(args.inp)
-    out = Path(args.out)
+# --sweep keys: the sheet line threshold plus the clean_mask_from_crop arguments, with the defaults used by a run
+SWEEP_DEFAULTS = {"sheet_thr": SHEET_LINE_THR, "blur_sigma": 6.0, "diff_thr": 8.0,
+                  "open_iter": 1, "close_iter": 2, "dil_iter": 1}
+SWEEP_THUMB = 96
+
+
+def sweep_settings(specs):
+    """Cartesian product of KEY=v1,v2,... specs over SWEEP_DEFAULTS."""
+    axes = []
+    for spec in specs:
+        key, _, values = spec.partition("=")
+        if key not in SWEEP_DEFAULTS:
+            raise SystemExit(f"Unknown sweep key {key!r} (expected one of {', '.join(SWEEP_DEFAULTS)})")
+        kind = type(SWEEP_DEFAULTS[key])
+        axes.append([(key, kind(v)) for v in values.split(",")])
+    return [{**SWEEP_DEFAULTS, **dict(combo)} for combo in itertools.product(*axes)]
+
+
+def match_groups(reference: dict, bboxes):
+    """{name: bbox} of the group overlapping each reference bbox most (IoU), or None when nothing overlaps."""
+    def iou(a, b):
+        ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+        iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+        inter = ix * iy
+        union = (a[2]-a[0])*(a[3]-a[1]) + (b[2]-b[0])*(b[3]-b[1]) - inter
+        return inter / union if union else 0.0
+    boxes = [bb[1:5] for bb in bboxes]
+    out = {}
+    for name, ref in reference.items():
+        scores = [iou(ref, b) for b in boxes]
+        best = int(np.argmax(scores)) if scores else -1
+        out[name] = tuple(boxes[best]) if best >= 0 and scores[best] > 0 else None
+    return out
+
+
+def sweep_metrics(mask: np.ndarray):
+    alpha = (np.clip(ndimage.gaussian_filter(mask.astype(np.float32), sigma=0.6), 0, 1) * 255).astype(np.uint8)
+    border = np.concatenate([alpha[0,:], alpha[-1,:], alpha[:,0], alpha[:,-1]])
+    return {"ink_coverage": float(mask.mean()), "components": int(ndimage.label(mask)[1]),
+            "border_alpha_max": int(border.max())}
+
+
+def sweep_thumb(mask: np.ndarray, size:int=SWEEP_THUMB):
+    im = Image.fromarray(np.where(mask, 235, 20).astype(np.uint8))
+    im.thumbnail((size, size), Image.BILINEAR)
+    return im
+
+
+def run_sweep(sheet: np.ndarray, gray: np.ndarray, settings, names, engine:str, out_dir: Path, timer):
+    """Evaluate every setting on every glyph; writes sweep.json and the sweep.png comparison sheet."""
+    with timer.stage("blur"):
+        sheet_diff = gray - ndimage.gaussian_filter(gray, sigma=SHEET_BLUR_SIGMA)
+    groups = {}  # sheet_thr -> {name: bbox}
+    with timer.stage("sweep_detection"):
+        _, ref = find_glyph_groups(sheet_diff > SHEET_LINE_THR, engine=engine)
+        by_id = {i: (x0,y0,x1,y1) for i,x0,y0,x1,y1,_ in ref}
+        reference = {name: by_id[ID_MAP[name]] for name in names}
+        for thr in sorted({s["sheet_thr"] for s in settings}):
+            groups[thr] = reference if thr == SHEET_LINE_THR else \
+                match_groups(reference, find_glyph_groups(sheet_diff > thr, engine=engine)[1])
+
+    crops = {}  # bbox -> CropMasks, shared by every setting that finds the same group
+    rows = []
+    thumbs = []
+    for s in settings:
+        t = time.perf_counter()
+        with timer.stage("sweep_setting", **s):
+            per_glyph, row_thumbs = {}, []
+            for name in names:
+                bb = groups[s["sheet_thr"]][name]
+                if bb is None:
+                    per_glyph[name] = None
+                    row_thumbs.append(None)
+                    continue
+                if bb not in crops:
+                    crops[bb] = CropMasks(extract_crop_array(sheet, *bb, pad=30))
+                mask = crops[bb].mask(s["blur_sigma"], s["diff_thr"], s["open_iter"], s["close_iter"], s["dil_iter"])
+                per_glyph[name] = sweep_metrics(mask)
+                row_thumbs.append(sweep_thumb(mask))
+        found = [m for m in per_glyph.values() if m]
+        rows.append({
+            "setting": s,
+            "glyphs_found": len(found),
+            "mean_ink_coverage": float(np.mean([m["ink_coverage"] for m in found])) if found else 0.0,
+            "components": int(sum(m["components"] for m in found)),
+            "border_alpha_max": int(max((m["border_alpha_max"] for m in found), default=0)),
+            "seconds": time.perf_counter() - t,
+            "glyphs": per_glyph,
+        })
+        thumbs.append(row_thumbs)
+
+    with timer.stage("sweep_sheet"):
+        label_w, head, cell = 380, 20, SWEEP_THUMB + 4
+        comp = Image.new("RGB", (label_w + cell*len(names), head + cell*len(settings)), (40,40,40))
+        draw = ImageDraw.Draw(comp)
+        for j, name in enumerate(names):
+            draw.text((label_w + j*cell + 4, 4), name, fill=(255,255,255))
+        for i, (row, row_thumbs) in enumerate(zip(rows, thumbs)):
+            y = head + i*cell
+            draw.text((4, y + 4), " ".join(f"{k}={v:g}" for k, v in row["setting"].items()), fill=(255,255,255))
+            draw.text((4, y + 20), f"cov {row['mean_ink_coverage']:.3f}  comps {row['components']}  "
+                      f"border {row['border_alpha_max']}", fill=(200,200,120))
+            for j, th in enumerate(row_thumbs):
+                if th is not None:
+                    comp.paste(th, (label_w + j*cell + 2 + (SWEEP_THUMB - th.size[0])//2,
+                                    y + 2 + (SWEEP_THUMB - th.size[1])//2))
+        out_dir.mkdir(parents=True, exist_ok=True)
+        comp.save(out_dir/"sweep.png")
+    (out_dir/"sweep.json").write_text(json.dumps(to_builtin({"names": names, "settings": rows}), indent=2),
+                                      encoding="utf-8")
+    return rows
+
+
+ID_REFS = Path(__file__).resolve().parent / "aligned_clean_1024"
+ID_SIZE = 64          # template side, px
+ID_MARGIN = 4         # px around the scaled glyph inside the template
+ID_BLUR = 1.5         # template blur sigma, px; tolerates stroke offsets between styles
+ID_MIN_SCORE = 0.5    # correlation below this is reported as low confidence
+ID_MIN_MARGIN = 0.05  # as is another digit's template scoring within this of the winner
+
+
+def id_template(alpha: np.ndarray) -> np.ndarray:
+    """Zero-mean, unit-norm ID_SIZE^2 template of a glyph alpha (or mask), scaled by its bbox and centred."""
+    a = np.asarray(alpha)
+    if a.dtype == bool:
+        a = a.astype(np.uint8) * 255
+    t = np.zeros((ID_SIZE, ID_SIZE), np.float32)
+    bb = bbox_alpha(a)
+    if bb is not None:
+        x0,y0,x1,y1 = bb
+        scale = (ID_SIZE - 2*ID_MARGIN) / max(x1-x0, y1-y0)
+        w, h = max(1, round((x1-x0)*scale)), max(1, round((y1-y0)*scale))
+        small = np.asarray(Image.fromarray(np.ascontiguousarray(a[y0:y1, x0:x1])).resize((w, h), Image.BOX))
+        oy, ox = (ID_SIZE - h)//2, (ID_SIZE - w)//2
+        t[oy:oy+h, ox:ox+w] = small
+        t = ndimage.gaussian_filter(t, sigma=ID_BLUR)
+    v = t.ravel() - t.mean()
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
+
+
+def load_id_refs(ref_dir: Path):
+    """(names, (R, ID_SIZE^2) templates) of the reference glyph PNGs, e.g. aligned_clean_1024/*.png."""
+    paths = sorted(Path(ref_dir).glob("*.png"))
+    if not paths:
+        raise SystemExit(f"No reference glyphs in {ref_dir}")
+    return [p.stem for p in paths], np.stack([id_template(np.asarray(Image.open(p).getchannel("A"))) for p in paths])
+
+
+def identify_glyphs(sheet: np.ndarray, bboxes, refs):
+    """Name glyph groups by template correlation against the references.
+
+    Every group is scored against every reference in one matrix product, and
+    linear_sum_assignment picks the one-to-one mapping with the highest total
+    correlation. The margin is the lead over the best template of a different
+    digit (6 vs 6_alt is not a conflict). Returns (id_map {name: group label},
+    report for the QC file).
+    """
+    ref_names, ref_t = refs
+    labels = [bb[0] for bb in bboxes]
+    clean, line = [], []
+    for _, x0,y0,x1,y1, _ in bboxes:
+        # Only the group's own bbox counts; the 30px crop pad is blur context and may
+        # hold a neighbour's strokes. The cleaned mask is what gets exported, but its
+        # opening erases strokes under ~3px, so the raw line mask is scored as well.
+        masks = CropMasks(extract_crop_array(sheet, x0,y0,x1,y1, pad=30))
+        ox, oy = x0 - max(0, x0-30), y0 - max(0, y0-30)
+        inner = (slice(oy, oy+y1-y0), slice(ox, ox+x1-x0))
+        clean.append(id_template(masks.mask()[inner]))
+        line.append(id_template(masks.line_mask()[inner]))
+    # (groups, refs) Pearson correlation, the better of the two masks per pair
+    scores = np.maximum(np.stack(clean) @ ref_t.T, np.stack(line) @ ref_t.T)
+    rows, cols = linear_sum_assignment(scores, maximize=True)
+    digit = np.array([n.split("_")[0] for n in ref_names])
+    id_map, assignments, low = {}, {}, []
+    for g, r in sorted(zip(rows.tolist(), cols.tolist()), key=lambda gr: ref_names[gr[1]]):
+        name = ref_names[r]
+        other = np.where(digit != digit[r], scores[g], -np.inf)
+        runner = int(np.argmax(other))
+        margin = float(scores[g, r] - other[runner]) if np.isfinite(other[runner]) else 1.0
+        id_map[name] = int(labels[g])
+        assignments[name] = {"group": int(labels[g]), "score": float(scores[g, r]), "margin": margin,
+                             "runner_up": ref_names[runner] if np.isfinite(other[runner]) else None}
+        if scores[g, r] < ID_MIN_SCORE or margin < ID_MIN_MARGIN:
+            low.append(name)
+    return id_map, {
+        "method": "template correlation + linear_sum_assignment",
+        "template_px": ID_SIZE,
+        "assignments": assignments,
+        "min_score": min((a["score"] for a in assignments.values()), default=0.0),
+        "min_margin": min((a["margin"] for a in assignments.values()), default=0.0),
+        "low_confidence": low,
+        "unassigned_groups": sorted(int(labels[g]) for g in set(range(len(labels))) - set(rows.tolist())),
+        "missing": sorted(set(ref_names) - set(id_map)),
+    }
+
+
+def run_sheet(inp: Path, out: Path, args, refs=None, trace=None):
+    """Export one numbers sheet into out/ and out.zip; returns a summary for the batch report.
+
+    With refs (load_id_refs()) the digits are identified automatically instead of using ID_MAP.
+    """
+    timer = StageTimer()
     out.mkdir(parents=True, exist_ok=True)
 
-    im = Image.open(inp).convert("RGB")
-    gray = np.array(im.convert("L")).astype(np.float32)
-    blur = ndimage.gaussian_filter(gray, sigma=8)
-    diff = gray - blur
+    if args.tile:
+        work_dir = Path(tempfile.mkdtemp(prefix="numbers_tiles_"))
+        atexit.register(shutil.rmtree, work_dir, ignore_errors=True)
+        with timer.stage("sheet_decode", memmap=True):
+            sheet, gray = decode_sheet_memmap(inp, work_dir)
+    else:
+        with timer.stage("sheet_decode"):
+            im = Image.open(inp).convert("RGB")
+            sheet = np.asarray(im)
+            gray = np.array(im.convert("L")).astype(np.float32)
+
+    if args.sweep:
+        settings = sweep_settings(args.sweep)
+        t = time.perf_counter()
+        rows = run_sweep(sheet, gray, settings, list(ID_MAP), args.group_engine, out/"sweep", timer)
+        for r in rows:
+            print(f"  {' '.join(f'{k}={v:g}' for k, v in r['setting'].items())}: glyphs {r['glyphs_found']} "
+                  f"coverage {r['mean_ink_coverage']:.3f} components {r['components']} "
+                  f"border alpha {r['border_alpha_max']}")
+        print(f"Swept {len(settings)} settings in {time.perf_counter() - t:.2f}s -> {out/'sweep'}")
+        if trace:
+            Path(trace).write_text(json.dumps(timer.chrome_trace()), encoding="utf-8")
+        return {"input": str(inp), "sweep_settings": len(settings)}
 
-    # line mask + dilation to merge internal holes -> glyph groups
-    mask_line = diff > 10.0
-    group_mask = ndimage.binary_dilation(mask_line, iterations=25)
-    lbl, n = ndimage.label(group_mask)
+    if args.pyramid or args.tile:
+        if args.pyramid:
+            mode = f"{args.pyramid}x pyramid"
+            with timer.stage("detection", mode=mode):
+                n, bboxes = find_glyph_groups_pyramid(gray, args.pyramid, engine=args.group_engine)
+        else:
+            mode = f"{args.tile}px tiles"
+            with timer.stage("detection", mode=mode):
+                n, bboxes = find_glyph_groups_tiled(gray, args.tile, engine=args.group_engine)
+        if args.check_groups:
+            n_full, bboxes_full = find_glyph_groups(sheet_line_mask(gray), engine=args.group_engine)
+            if (n, bboxes) != (n_full, bboxes_full):
+                raise SystemExit(f"Grouping disagrees: {n} groups from {mode}, {n_full} from the full sheet")
+            print(f"Group check OK: {mode} and full sheet agree on {n} groups")
+    else:
+        # line mask + dilation to merge internal holes -> glyph groups
+        with timer.stage("blur"):
+            mask_line = sheet_line_mask(gray)
+        n, bboxes = find_glyph_groups(mask_line, engine=args.group_engine, timer=timer)
+        if args.check_groups:
+            other = "dilate" if args.group_engine != "dilate" else "distance"
+            n_other, bboxes_other = find_glyph_groups(mask_line, engine=other)
+            if (n, bboxes) != (n_other, bboxes_other):
+                raise SystemExit(f"Group engines disagree: {args.group_engine} found {n} groups, {other} found {n_other}")
+            print(f"Group check OK: {args.group_engine} and {other} agree on {n} groups")
     if n < 10:
         raise SystemExit(f"Expected at least 10 glyph groups, got {n}")
 
-    objects = ndimage.find_objects(lbl)
-    bboxes = []
-    for i, sl in enumerate(objects, start=1):
-        if sl is None:
-            continue
-        ys, xs = sl
-        y0,y1 = ys.start, ys.stop
-        x0,x1 = xs.start, xs.stop
-        area = int((lbl[sl] == i).sum())
-        bboxes.append((i, x0,y0,x1,y1, area))
-
     # Sort groups top-to-bottom, left-to-right
     def centroid(bb):
         _,x0,y0,x1,y1,_ = bb
@@ -185,64 +871,156 @@ def main():
 
     bboxes_sorted = sorted(bboxes, key=lambda bb: (centroid(bb)[1], centroid(bb)[0]))
 
-    # This sheet contains duplicates for 6 and 7 (bottom row). Export them as *_alt too.
-    # Mapping verified visually against the provided sheet.
-    id_map = {"0":3,"1":2,"2":1,"3":4,"4":7,"5":8,"6":5,"7":6,"6_alt":9,"7_alt":10,"8":11,"9":12}
+    identification = None
+    if refs is not None:
+        with timer.stage("identify"):
+            id_map, identification = identify_glyphs(sheet, bboxes, refs)
+        for name in identification["low_confidence"]:
+            a = identification["assignments"][name]
+            print(f"WARN: {inp.name}: {name} -> group {a['group']} is low confidence "
+                  f"(score {a['score']:.3f}, margin {a['margin']:.3f} over {a['runner_up']})")
+    else:
+        id_map = ID_MAP
     bbox_by_id = {i:(x0,y0,x1,y1) for i,x0,y0,x1,y1,_ in bboxes}
 
-    # Output dirs
-    for sub in ["tight_clean","tight_shadow","aligned_clean_1024","aligned_shadow_1024","previews"]:
-        (out/sub).mkdir(parents=True, exist_ok=True)
-
-    metrics = {}
-    for name, gid in id_map.items():
-        x0,y0,x1,y1 = bbox_by_id[gid]
-        crop = extract_crop(im, x0,y0,x1,y1, pad=30)
-        mask = clean_mask_from_crop(crop, blur_sigma=6, diff_thr=8, open_iter=1, close_iter=2, dil_iter=1)
-        rgba = rgba_from_mask(crop, mask, alpha_blur=0.6)
-        tight = tight_crop_rgba(rgba, pad=10)
-        tight.save(out/"tight_clean"/f"{name}.png")
-        sh_tight = add_shadow_rgba(tight, dx=14, dy=14, blur=8, opacity=180)
-        sh_tight.save(out/"tight_shadow"/f"{name}_shadow.png")
+    # Outputs stay in memory as encoded bytes and go to disk and into the zip as each
+    # glyph finishes; the preview sheets take the aligned images from the glyph stage.
+    glyph_jobs = [(name, bbox_by_id[gid]) for name, gid in id_map.items()]
+    order_0_9 = ["0","1","2","3","4","5","6","7","8","9"]
+    zip_path = out.with_suffix(".zip")
+    metrics, sheet_imgs = {}, {}
 
-        aligned, am = aligned_canvas(tight, canvas=1024, baseline_y=960, target_h=860)
-        aligned.save(out/"aligned_clean_1024"/f"{name}.png")
-        sh_aligned = add_shadow_rgba(aligned, dx=20, dy=20, blur=12, opacity=160)
-        sh_aligned.save(out/"aligned_shadow_1024"/f"{name}_shadow.png")
+    def emit(files: dict, **stage_args):
+        with timer.stage("write_files", **stage_args):
+            for rel, data in files.items():
+                (out/rel).parent.mkdir(parents=True, exist_ok=True)
+                (out/rel).write_bytes(data)
+        with timer.stage("zip", **stage_args):
+            for rel, data in files.items():
+                pack.add(rel, data)
 
-        # quick previews
-        composite_on_bg(tight, bg=(12,12,12)).save(out/"previews"/f"{name}_tight_dark.png")
-        composite_on_bg(tight, bg=(245,245,245)).save(out/"previews"/f"{name}_tight_white.png")
+    with ZipPackager(zip_path) as pack:
+        for name, r in process_glyphs(sheet, glyph_jobs, workers=args.jobs, timer=timer):
+            metrics[name] = r["metrics"]
+            if name in order_0_9:
+                sheet_imgs[name] = (r["aligned"], r["sh_aligned"])
+            emit(r["files"], glyph=name)
 
-        # QC: border alpha check on aligned
-        a = np.array(aligned.split()[-1])
-        border = np.concatenate([a[0,:], a[-1,:], a[:,0], a[:,-1]])
-        metrics[name] = {"align": am, "aligned_border_alpha_max": int(border.max())}
+        with timer.stage("preview_sheets"):
+            # an auto-identified sheet may lack some digits; the sheets show the ones found
+            shown = [n for n in order_0_9 if n in sheet_imgs]
+            clean = make_sheet([sheet_imgs[n][0] for n in shown], cols=5, bg=(15,15,15))
+            shadow = make_sheet([sheet_imgs[n][1] for n in shown], cols=5, bg=(245,245,245))
+            previews = {"previews/sheet_0-9_clean_dark.png": encode_png(clean),
+                        "previews/sheet_0-9_shadow_white.png": encode_png(shadow)}
+        del sheet_imgs, clean, shadow
+        emit(previews)
 
-    # Sheets
-    order_0_9 = ["0","1","2","3","4","5","6","7","8","9"]
-    clean_paths = [out/"aligned_clean_1024"/f"{n}.png" for n in order_0_9]
-    shadow_paths = [out/"aligned_shadow_1024"/f"{n}_shadow.png" for n in order_0_9]
-    make_sheet(clean_paths, cols=5, bg=(15,15,15), out_path=out/"previews"/"sheet_0-9_clean_dark.png")
-    make_sheet(shadow_paths, cols=5, bg=(245,245,245), out_path=out/"previews"/"sheet_0-9_shadow_white.png")
-
-    qc = {
-        "input": str(inp),
-        "glyph_groups_found": int(n),
-        "id_map": id_map,
-        "bboxes_sorted": [(int(i), int(x0), int(y0), int(x1), int(y1), int(a)) for i,x0,y0,x1,y1,a in bboxes_sorted],
-        "metrics": metrics,
-    }
+        qc = {
+            "input": str(inp),
+            "glyph_groups_found": int(n),
+            "group_engine": args.group_engine,
+            "id_map": id_map,
+            "bboxes_sorted": [(int(i), int(x0), int(y0), int(x1), int(y1), int(a)) for i,x0,y0,x1,y1,a in bboxes_sorted],
+            "metrics": metrics,
+        }
+        if identification is not None:
+            qc["identification"] = identification
+        # The zipped QC leaves out the timings so the archive only changes when the outputs do
+        pack.add("qc_numbers.json", json.dumps(to_builtin(qc), indent=2).encode("utf-8"))
+    qc["timings"] = timer.report()
     (out/"qc_numbers.json").write_text(json.dumps(to_builtin(qc), indent=2), encoding="utf-8")
-
-    # Zip everything
-    zip_path = out.with_suffix(".zip")
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
-        for root,_,files in os.walk(out):
-            for f in files:
-                p = Path(root)/f
-                z.write(p, arcname=str(p.relative_to(out)))
+    if trace:
+        Path(trace).write_text(json.dumps(timer.chrome_trace()), encoding="utf-8")
+        print(f"Wrote: {trace}")
     print(f"Wrote: {zip_path}")
+    summary = {"input": str(inp), "zip": str(zip_path), "glyph_groups_found": int(n), "id_map": id_map}
+    if identification is not None:
+        summary.update({k: identification[k] for k in ("min_score", "min_margin", "low_confidence", "missing")})
+    return summary
+
+
+def _sheet_task(inp: str, out: str, args, refs, trace):
+    """run_sheet() for the batch; a failing sheet becomes {"input", "error"} instead of aborting the batch."""
+    try:
+        return run_sheet(Path(inp), Path(out), args, refs=refs, trace=trace)
+    except (Exception, SystemExit) as e:
+        return {"input": inp, "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(sheets, out: Path, args, refs):
+    """run_sheet() every sheet into out/<stem>/ and out/<stem>.zip, --jobs sheets at a time."""
+    sheet_args = argparse.Namespace(**{**vars(args), "jobs": 1})
+    traces = [str(Path(args.trace).with_name(f"{Path(args.trace).stem}_{p.stem}.json")) if args.trace else None
+              for p in sheets]
+    jobs = [(str(p), str(out/p.stem), sheet_args, refs, t) for p, t in zip(sheets, traces)]
+    if args.jobs <= 1:
+        return [_sheet_task(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+        return list(ex.map(_sheet_task, *zip(*jobs)))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in", dest="inp", required=True,
+                    help="Input numbers sheet PNG, or a directory of sheets: each goes to <out>/<sheet>/ and "
+                         "<out>/<sheet>.zip with --auto-id, plus batch_summary.json; failed sheets are listed there")
+    ap.add_argument("--out", dest="out", required=True, help="Output directory")
+    ap.add_argument("--group-engine", choices=sorted(GROUP_ENGINES), default="dilate",
+                    help="How line pixels are merged into glyph groups: dilate (binary_dilation, cost grows "
+                         "with the radius) or distance (taxicab distance transform, same mask) (default: dilate)")
+    ap.add_argument("--check-groups", action="store_true",
+                    help="Also run the other group engine (with --tile/--pyramid: a full-sheet pass) "
+                         "and fail unless both agree")
+    ap.add_argument("--tile", type=int, default=0,
+                    help="Detect groups tile-by-tile from memmaps with NxN tiles, for scans too large for memory; "
+                         "same groups as the whole sheet (default: 0, whole sheet)")
+    ap.add_argument("--pyramid", type=int, choices=[2,4,8], default=0,
+                    help="Find groups on a downsampled copy, then refine each at full resolution; "
+                         "pays off on sparse scans (mostly background), about break-even when glyphs fill the sheet")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="Worker processes for per-glyph stages (the sheet is shared, not pickled), "
+                         "or for whole sheets in batch mode (default: 1, serial)")
+    ap.add_argument("--trace", help="Also write the per-stage timings as a Chrome trace JSON file (chrome://tracing, Perfetto)")
+    ap.add_argument("--sweep", action="append", metavar="KEY=v1,v2,...",
+                    help="Sweep cleanup parameters instead of exporting; writes sweep/sweep.json and sweep/sweep.png "
+                         f"(repeatable; keys: {', '.join(SWEEP_DEFAULTS)})")
+    ap.add_argument("--auto-id", action="store_true",
+                    help="Identify digits by template matching instead of the fixed id_map (always on for a directory)")
+    ap.add_argument("--refs", default=str(ID_REFS), help="Reference glyph PNGs for identification (default: aligned_clean_1024)")
+    args = ap.parse_args()
+    if args.sweep and (args.tile or args.pyramid):
+        raise SystemExit("--sweep runs on the whole sheet; drop --tile/--pyramid")
+
+    inp = Path(args.inp)
+    out = Path(args.out)
+    if not inp.is_dir():
+        refs = load_id_refs(Path(args.refs)) if args.auto_id else None
+        run_sheet(inp, out, args, refs=refs, trace=args.trace)
+        return
+
+    if args.sweep:
+        raise SystemExit("--sweep takes a single sheet, not a directory")
+    sheets = sorted(inp.glob("*.png"))
+    if not sheets:
+        raise SystemExit(f"No sheets (*.png) in {inp}")
+    refs = load_id_refs(Path(args.refs))
+    out.mkdir(parents=True, exist_ok=True)
+    t = time.perf_counter()
+    summaries = run_batch(sheets, out, args, refs)
+    (out/"batch_summary.json").write_text(json.dumps(to_builtin(summaries), indent=2), encoding="utf-8")
+    failed = [s for s in summaries if "error" in s]
+    for s in summaries:
+        if "error" in s:
+            print(f"  {Path(s['input']).name}: FAILED  {s['error']}")
+            continue
+        notes = "".join([f"  LOW CONFIDENCE: {', '.join(s['low_confidence'])}" if s["low_confidence"] else "",
+                         f"  missing: {', '.join(s['missing'])}" if s["missing"] else ""])
+        print(f"  {Path(s['input']).name}: {len(s['id_map'])} glyphs, min score {s['min_score']:.3f}, "
+              f"min margin {s['min_margin']:.3f}{notes}")
+    print(f"Processed {len(sheets)} sheets in {time.perf_counter() - t:.2f}s -> {out/'batch_summary.json'}")
+    if failed:
+        raise SystemExit(f"{len(failed)} of {len(sheets)} sheets failed (see \"error\" in batch_summary.json)")
 
 if __name__ == "__main__":
     main()
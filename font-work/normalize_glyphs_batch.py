@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Batched glyph normalizer covering normalize_glyphs.py (v1) and
+normalize_glyphs_v2.py (v2) as modes, with byte-identical output.
+
+Glyphs are decoded into a stacked (N,H,W) uint8 array per batch; ink bboxes come
+from row/column any() reductions over the whole stack, pasting and binarization
+are array ops on an (N,CH,CW) output stack, and decode/resize/encode run on a
+thread pool (PIL releases the GIL for those).
+
+Usage:
+  python3 normalize_glyphs_batch.py --mode v2 --in-dir glyph_png --out-dir glyph_png_norm --jobs 8
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+from PIL import Image
+
+
+def load_gray(path: Path) -> np.ndarray:
+    with Image.open(path) as im:
+        return np.asarray(im.convert("L"))
+
+
+def stack_padded(arrays: list[np.ndarray], fill: int = 255) -> np.ndarray:
+    H = max(a.shape[0] for a in arrays)
+    W = max(a.shape[1] for a in arrays)
+    stack = np.full((len(arrays), H, W), fill, dtype=np.uint8)
+    for i, a in enumerate(arrays):
+        stack[i, :a.shape[0], :a.shape[1]] = a
+    return stack
+
+
+def ink_bboxes(stack: np.ndarray, ink_thresh: int):
+    """Vectorized ink_bbox over a (N,H,W) stack: (valid, x0, y0, x1, y1) arrays."""
+    mask = stack < ink_thresh
+    rows = mask.any(axis=2)
+    cols = mask.any(axis=1)
+    valid = rows.any(axis=1)
+    H, W = stack.shape[1:]
+    y0 = rows.argmax(axis=1)
+    y1 = H - rows[:, ::-1].argmax(axis=1)
+    x0 = cols.argmax(axis=1)
+    x1 = W - cols[:, ::-1].argmax(axis=1)
+    return valid, x0, y0, x1, y1
+
+
+def fit_v1(glyph: Image.Image, CW: int, CH: int, args) -> Image.Image:
+    gw, gh = glyph.size
+    max_w = CW - 2 * args.side_margin
+    max_h = CH - args.bottom_margin - 40  # top margin ~40
+    scale = min(1.0, max_w / max(1, gw), max_h / max(1, gh))
+    if scale < 1.0:
+        glyph = glyph.resize((int(gw * scale), int(gh * scale)), Image.Resampling.LANCZOS)
+    return glyph
+
+
+def fit_v2(glyph: Image.Image, CW: int, CH: int, args) -> Image.Image:
+    gw, gh = glyph.size
+    scale = args.target_height / max(1, gh)
+    glyph = glyph.resize((max(1, int(round(gw * scale))), max(1, int(round(gh * scale)))),
+                         Image.Resampling.LANCZOS)
+    gw, gh = glyph.size
+    max_w = CW - 2 * args.side_margin
+    if gw > max_w:
+        scale2 = max_w / gw
+        glyph = glyph.resize((max(1, int(gw * scale2)), max(1, int(gh * scale2))), Image.Resampling.LANCZOS)
+    return glyph
+
+
+MODES = {
+    # mode: (fit, default bottom margin, crop pad used)
+    "v1": (fit_v1, 60, False),
+    "v2": (fit_v2, 70, True),
+}
+
+
+def paste_into(canvas: np.ndarray, glyph: np.ndarray, px: int, py: int):
+    """Image.paste semantics (clipped at the canvas edges) on a 2D uint8 array."""
+    CH, CW = canvas.shape
+    gh, gw = glyph.shape
+    cx0, cy0 = max(0, px), max(0, py)
+    cx1, cy1 = min(CW, px + gw), min(CH, py + gh)
+    if cx0 < cx1 and cy0 < cy1:
+        canvas[cy0:cy1, cx0:cx1] = glyph[cy0 - py:cy1 - py, cx0 - px:cx1 - px]
+
+
+def normalize_batch(paths: list[Path], out_dir: Path, CW: int, CH: int, args, pool) -> int:
+    fit, _, use_pad = MODES[args.mode]
+    arrays = list(pool.map(load_gray, paths))
+    sizes = [a.shape for a in arrays]
+    stack = stack_padded(arrays)
+    del arrays
+
+    valid, x0, y0, x1, y1 = ink_bboxes(stack, args.ink_thresh)
+    idx = np.flatnonzero(valid)
+    if use_pad:
+        hs = np.array([sizes[i][0] for i in idx])
+        ws = np.array([sizes[i][1] for i in idx])
+        x0[idx] = np.maximum(0, x0[idx] - args.keep_pad)
+        y0[idx] = np.maximum(0, y0[idx] - args.keep_pad)
+        x1[idx] = np.minimum(ws, x1[idx] + args.keep_pad)
+        y1[idx] = np.minimum(hs, y1[idx] + args.keep_pad)
+
+    def fit_one(i):
+        crop = Image.fromarray(stack[i, y0[i]:y1[i], x0[i]:x1[i]])
+        return np.asarray(fit(crop, CW, CH, args))
+
+    glyphs = list(pool.map(fit_one, idx))
+
+    out = np.full((len(idx), CH, CW), 255, dtype=np.uint8)
+    for k, g in enumerate(glyphs):
+        gh, gw = g.shape
+        paste_into(out[k], g, (CW - gw) // 2, (CH - args.bottom_margin) - gh)
+
+    # Hard binarize the whole stack at once
+    out = np.where(out < args.ink_thresh, 0, 255).astype(np.uint8)
+
+    def save_one(k):
+        Image.fromarray(out[k]).save(out_dir / paths[idx[k]].name)
+
+    list(pool.map(save_one, range(len(idx))))
+    return len(idx)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mode", choices=sorted(MODES), default="v2", help="v1 = normalize_glyphs.py, v2 = normalize_glyphs_v2.py")
+    ap.add_argument("--in-dir", default="glyph_png")
+    ap.add_argument("--out-dir", default="glyph_png_norm")
+    ap.add_argument("--canvas", default="512x512")
+    ap.add_argument("--ink-thresh", type=int, default=245)
+    ap.add_argument("--target-height", type=int, default=380, help="v2: desired glyph ink height in px")
+    ap.add_argument("--bottom-margin", type=int, default=None, help="Distance from bottom to baseline (v1: 60, v2: 70)")
+    ap.add_argument("--side-margin", type=int, default=40)
+    ap.add_argument("--keep-pad", type=int, default=10, help="v2: extra pad around ink when cropping")
+    ap.add_argument("--batch", type=int, default=512, help="Glyphs stacked per batch")
+    ap.add_argument("--jobs", type=int, default=4, help="Threads for decode/resize/encode")
+    args = ap.parse_args()
+    if args.bottom_margin is None:
+        args.bottom_margin = MODES[args.mode][1]
+
+    CW, CH = map(int, args.canvas.lower().split("x"))
+
+    in_dir = Path(args.in_dir)
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    pngs = sorted(in_dir.glob("*.png"))
+    if not pngs:
+        raise SystemExit(f"No PNGs found in {in_dir}")
+
+    written = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for i in range(0, len(pngs), args.batch):
+            written += normalize_batch(pngs[i:i + args.batch], out_dir, CW, CH, args, pool)
+
+    print(f"Normalized {written} PNGs written to: {out_dir.resolve()}")
+
+if __name__ == "__main__":
+    main()
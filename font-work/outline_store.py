@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Pre-parsed outline store for the eps2write glyph sources.
+
+Every glyph_eps_clean/*.eps is an ~8.4k-line opdfread.ps program that only
+wraps one PDF content stream of m/l/c/h/f path operators. This parses those
+streams once (applying q/Q/cm, so coordinates are the PostScript points
+importOutlines would see) and writes all glyphs into one file:
+
+  8 bytes  magic b"GLYPHOUT"
+  u32      format version
+  u32      index length
+  ...      JSON index {name: {"cmds": [offset, count], "pts": [offset, count],
+                              "sha256": source digest, "bbox": [x0, y0, x1, y1]}}
+  ...      data, 8-byte aligned: per glyph uint8 command codes and float32
+           (x, y) points; index offsets are relative to the data start
+
+OutlineStore memory-maps the file; outlines are zero-copy views into the map
+and draw() replays them on any segment pen (fontforge glyphPen(), fontTools
+pens). Entries whose source digest no longer matches the EPS are reported as
+stale so the build scripts fall back to importOutlines.
+
+Usage:
+  python3 font-work/outline_store.py font-work/glyph_eps_clean
+  (writes font-work/glyph_eps_clean/outlines.bin)
+"""
+from __future__ import annotations
+import argparse, json, re, struct, time
+from pathlib import Path
+
+import numpy as np
+
+from glyph_cache import file_digest
+
+MAGIC = b"GLYPHOUT"
+VERSION = 1
+STORE_NAME = "outlines.bin"
+
+MOVE, LINE, CURVE, CLOSE = 0, 1, 2, 3
+NPTS = {MOVE: 1, LINE: 1, CURVE: 3, CLOSE: 0}
+
+FILL_OPS = {"f", "F", "f*", "B", "B*", "b", "b*"}
+DISCARD_OPS = {"n", "S", "s"}
+STATE_OPS = {"g", "G", "rg", "RG", "k", "K", "cs", "CS", "sc", "SC", "scn", "SCN",
+             "w", "J", "j", "M", "d", "i", "ri", "gs"}
+
+_STREAM = re.compile(rb"<<[^>]*/Length\s+(\d+)[^>]*>>\s*stream\r?\n")
+
+
+def content_stream(data: bytes) -> str:
+    """The page content stream eps2write embeds after the opdfread prolog."""
+    m = None
+    for m in _STREAM.finditer(data):
+        pass
+    if m is None:
+        raise ValueError("no content stream found")
+    start = m.end()
+    return data[start:start + int(m.group(1))].decode("latin-1")
+
+
+def _concat(a, b):
+    """PDF matrix product a x b for (a b c d e f) tuples."""
+    return (a[0]*b[0] + a[1]*b[2], a[0]*b[1] + a[1]*b[3],
+            a[2]*b[0] + a[3]*b[2], a[2]*b[1] + a[3]*b[3],
+            a[4]*b[0] + a[5]*b[2] + b[4], a[4]*b[1] + a[5]*b[3] + b[5])
+
+
+def parse_content(stream: str):
+    """Filled path geometry of a content stream as (cmds uint8 (N,), pts float32 (M, 2))."""
+    ctm = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    stack, operands = [], []
+    path_cmds, path_pts = [], []
+    cmds, pts = [], []
+    open_sub = False
+
+    def xf(x, y):
+        return (ctm[0]*x + ctm[2]*y + ctm[4], ctm[1]*x + ctm[3]*y + ctm[5])
+
+    def close():
+        nonlocal open_sub
+        if open_sub:
+            path_cmds.append(CLOSE)
+            open_sub = False
+
+    for tok in stream.split():
+        if tok[0] in "0123456789.-+":
+            operands.append(float(tok))
+            continue
+        if tok[0] == "/":
+            operands.append(tok)
+            continue
+        if tok == "q":
+            stack.append(ctm)
+        elif tok == "Q":
+            ctm = stack.pop()
+        elif tok == "cm":
+            ctm = _concat(tuple(operands[-6:]), ctm)
+        elif tok == "m":
+            close()
+            path_cmds.append(MOVE); path_pts.append(xf(*operands[-2:]))
+            open_sub = True
+        elif tok == "l":
+            path_cmds.append(LINE); path_pts.append(xf(*operands[-2:]))
+        elif tok == "c":
+            o = operands[-6:]
+            path_cmds.append(CURVE); path_pts += [xf(o[0], o[1]), xf(o[2], o[3]), xf(o[4], o[5])]
+        elif tok == "re":
+            x, y, w, h = operands[-4:]
+            close()
+            path_cmds += [MOVE, LINE, LINE, LINE, CLOSE]
+            path_pts += [xf(x, y), xf(x + w, y), xf(x + w, y + h), xf(x, y + h)]
+        elif tok == "h":
+            close()
+        elif tok in FILL_OPS or tok in DISCARD_OPS:
+            close()
+            if tok in FILL_OPS:
+                cmds += path_cmds
+                pts += path_pts
+            path_cmds, path_pts = [], []
+        elif tok not in STATE_OPS:
+            raise ValueError(f"unsupported content operator {tok!r}")
+        operands = []
+    return np.array(cmds, dtype=np.uint8), np.array(pts, dtype=np.float32).reshape(-1, 2)
+
+
+def parse_eps(path) -> tuple[np.ndarray, np.ndarray]:
+    return parse_content(content_stream(Path(path).read_bytes()))
+
+
+def draw_outline(cmds, pts, pen):
+    """Replay (cmds, pts) on a segment pen (moveTo/lineTo/curveTo/closePath)."""
+    xy = np.asarray(pts).tolist()
+    i = 0
+    for op in np.asarray(cmds).tolist():
+        if op == MOVE:
+            pen.moveTo(tuple(xy[i]))
+        elif op == LINE:
+            pen.lineTo(tuple(xy[i]))
+        elif op == CURVE:
+            pen.curveTo(tuple(xy[i]), tuple(xy[i + 1]), tuple(xy[i + 2]))
+        else:
+            pen.closePath()
+        i += NPTS[op]
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def write_store(sources: dict, out_path) -> dict:
+    """Parse {name: eps path} and write one store file; returns the index."""
+    parsed = {name: parse_eps(p) for name, p in sources.items()}
+    index, blobs, offset = {}, [], 0
+    for name, (cmds, pts) in parsed.items():
+        entry = {"sha256": file_digest(str(sources[name])),
+                 "bbox": [float(v) for v in (*pts.min(axis=0), *pts.max(axis=0))] if len(pts) else [0, 0, 0, 0]}
+        for key, arr in (("cmds", cmds), ("pts", pts)):
+            raw = arr.tobytes()
+            entry[key] = [offset, int(len(arr))]
+            blobs.append(raw + b"\0" * (_align(len(raw)) - len(raw)))
+            offset += _align(len(raw))
+        index[name] = entry
+
+    head = json.dumps(index, sort_keys=True).encode("utf-8")
+    base = _align(16 + len(head))
+    tmp = Path(str(out_path) + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(MAGIC + struct.pack("<II", VERSION, len(head)) + head)
+        fh.write(b"\0" * (base - 16 - len(head)))
+        for b in blobs:
+            fh.write(b)
+    tmp.replace(out_path)
+    return index
+
+
+class OutlineStore:
+    def __init__(self, path):
+        self.path = str(path)
+        self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if bytes(self._map[:8]) != MAGIC:
+            raise ValueError(f"{path}: not an outline store")
+        version, n = struct.unpack("<II", bytes(self._map[8:16]))
+        if version != VERSION:
+            raise ValueError(f"{path}: store version {version}, expected {VERSION}")
+        self.index = json.loads(bytes(self._map[16:16 + n]))
+        self._base = _align(16 + n)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def fresh(self, name: str, src_path: str) -> bool:
+        """True when the store has `name` and it was parsed from the current bytes of src_path."""
+        e = self.index.get(name)
+        return e is not None and e["sha256"] == file_digest(src_path)
+
+    def outline(self, name: str):
+        """(cmds, pts) views into the memory map."""
+        e = self.index[name]
+        (co, cn), (po, pn) = e["cmds"], e["pts"]
+        co += self._base
+        po += self._base
+        return self._map[co:co + cn], self._map[po:po + pn * 8].view(np.float32).reshape(pn, 2)
+
+    def draw(self, name: str, pen):
+        draw_outline(*self.outline(name), pen)
+
+
+def load_store(path):
+    """OutlineStore for path, or None when no store has been written."""
+    return OutlineStore(path) if Path(path).exists() else None
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("eps_dir", help="Directory of eps2write glyph sources")
+    ap.add_argument("--out", help=f"Store file (default: <eps_dir>/{STORE_NAME})")
+    args = ap.parse_args()
+
+    eps_dir = Path(args.eps_dir)
+    sources = {p.stem: p for p in sorted(eps_dir.glob("*.eps"))}
+    if not sources:
+        raise SystemExit(f"No EPS files in {eps_dir}")
+    out = Path(args.out or eps_dir / STORE_NAME)
+
+    t = time.perf_counter()
+    index = write_store(sources, out)
+    parse_s = time.perf_counter() - t
+
+    t = time.perf_counter()
+    store = OutlineStore(out)
+    for name in store.index:
+        cmds, pts = store.outline(name)
+        pts.sum()
+    load_s = time.perf_counter() - t
+
+    for name, e in index.items():
+        print(f"  {name:<6} {e['cmds'][1]:5d} cmds {e['pts'][1]:6d} pts  bbox {[round(v, 1) for v in e['bbox']]}")
+    print(f"Wrote {out} ({out.stat().st_size} bytes, {len(index)} glyphs): "
+          f"parse {parse_s*1000:.1f} ms, load all {load_s*1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
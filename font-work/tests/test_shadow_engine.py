@@ -0,0 +1,75 @@
+"""ShadowEngine: same pixels as the full-image blur it replaced; reuse must match fresh renders."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "graffiti_numbers_cleaned_pack"))
+from make_graffiti_numbers_clean import ShadowEngine  # noqa: E402
+
+
+def box(xy) -> Image.Image:
+    im = Image.new("RGBA", (160, 120), (0, 0, 0, 0))
+    ImageDraw.Draw(im).rectangle(xy, fill=(255, 255, 255, 255))
+    return im
+
+
+def reference_shadow(rgba, dx, dy, blur, opacity):
+    """The original add_shadow_rgba: blur the whole alpha, composite the shadow at (dx, dy)."""
+    a = rgba.split()[-1]
+    sh = a.filter(ImageFilter.GaussianBlur(radius=blur))
+    sh_arr = (np.array(sh, dtype=np.float32) * (opacity / 255.0)).clip(0, 255).astype(np.uint8)
+    sh_img = Image.new("RGBA", rgba.size, (0, 0, 0, 0))
+    sh_img.putalpha(Image.fromarray(sh_arr))
+    base = Image.new("RGBA", rgba.size, (0, 0, 0, 0))
+    # alpha_composite rejects a negative dest; cropping the source instead is the same composite
+    base.alpha_composite(sh_img, (max(dx, 0), max(dy, 0)), (max(-dx, 0), max(-dy, 0)))
+    base.alpha_composite(rgba, (0, 0))
+    return base
+
+
+def soft_glyph(xy) -> Image.Image:
+    """Antialiased ellipse with a hole, so the alpha has partial values."""
+    im = Image.new("RGBA", (640, 480), (0, 0, 0, 0))
+    d = ImageDraw.Draw(im)
+    x0, y0, x1, y1 = (4 * v for v in xy)
+    d.ellipse((x0, y0, x1, y1), fill=(230, 40, 90, 255))
+    d.rectangle(((3 * x0 + x1) // 4, (3 * y0 + y1) // 4, (x0 + x1) // 2, (y0 + y1) // 2), fill=(0, 0, 0, 0))
+    return im.resize((160, 120), Image.LANCZOS)
+
+
+@pytest.mark.parametrize("xy", [(30, 25, 90, 80), (0, 0, 50, 40), (110, 70, 160, 120), (0, 10, 160, 100)],
+                         ids=["inside", "top-left-edge", "bottom-right-edge", "full-width"])
+@pytest.mark.parametrize("dx, dy, blur, opacity", [
+    (14, 14, 8, 180), (-9, -6, 5, 200), (7, -12, 2.5, 255), (-20, 3, 0.7, 90), (0, 0, 12, 128),
+])
+def test_matches_full_image_blur(xy, dx, dy, blur, opacity):
+    im = soft_glyph(xy)
+    got = ShadowEngine().render(im, dx, dy, blur, opacity)
+    assert got.tobytes() == reference_shadow(im, dx, dy, blur, opacity).tobytes()
+
+
+def test_one_engine_two_images_matches_fresh_renders():
+    a, b = box((20, 20, 60, 50)), box((70, 40, 140, 100))
+    engine = ShadowEngine()
+    specs = [(14, 14, 8, 180), (20, 20, 12, 160)]
+    for im in (a, b, a):
+        for got, (dx, dy, blur, opacity) in zip(engine.variants(im, specs), specs):
+            want = ShadowEngine().render(im, dx, dy, blur, opacity)
+            assert got.tobytes() == want.tobytes()
+
+
+def test_same_bbox_different_content_is_not_a_cache_hit():
+    a = box((20, 20, 60, 50))
+    b = a.copy()
+    ImageDraw.Draw(b).rectangle((30, 30, 50, 40), fill=(255, 255, 255, 0))  # hole, same bbox
+    engine = ShadowEngine()
+    engine.render(a)
+    assert engine.render(b).tobytes() == ShadowEngine().render(b).tobytes()
+
+
+def test_empty_alpha_returns_a_copy():
+    im = Image.new("RGBA", (32, 32), (0, 0, 0, 0))
+    assert ShadowEngine().render(im).tobytes() == im.tobytes()
@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+In-process raster-to-outline tracer for the binarized glyph PNGs written by
+normalize_glyphs_v2.py (black ink on white), replacing importImage + autoTrace
+in build_clock_font_from_png.py (TRACER = "native").
+
+Per glyph:
+  1. contour extraction: pixel-crack boundary loops of the ink mask (outer loops
+     and holes, diagonal-only touches kept apart); loops enclosing at most
+     --speckle px are dropped, like potrace's turdsize,
+  2. corners: Douglas-Peucker over the edge midpoints at CORNER_TOL (or
+     --tolerance if larger); simplified vertices turning more than
+     --corner-angle are corners, the only places a contour is cut before fitting,
+  3. curve fitting: each run between corners becomes a line when it stays within
+     --tolerance of its chord, otherwise least-squares cubics (Schneider's fit,
+     split at the worst point until within --tolerance, then neighbouring pieces
+     re-fitted as one cubic wherever that still fits); --quadratic converts the
+     cubics with fontTools cu2qu at the same tolerance.
+
+Tolerances, speckle size and smoothing are in source pixels. --scale N says the
+PNG is a source raster upscaled N times (glyph_png_norm is glyph_png at about
+2.2x for the digits), so the upscaled 2-3 px staircase steps are smoothed over
+instead of traced as corners.
+
+On the archived glyph_png set (163x205) the defaults give 579 on-curve nodes for
+the 13 glyphs, against 614 segments in the autoTrace outlines of glyph_eps_clean;
+glyph_png_norm at --scale 2.2 gives 556. Traced from the same glyph_png_bold
+masters as those outlines, 567 nodes and 7% more mismatched pixels.
+
+Contours come back in glyph_cache's serialized form ({"closed", "quadratic",
+"points": [[x, y, on], ...]}), in pixel units with y up and outer contours
+clockwise (TrueType direction), so contours_to_layer() feeds them straight into
+a fontforge glyph. Glyphs are independent and trace on a process pool (--jobs).
+
+The report lists on-curve nodes and the fraction of pixels whose coverage
+differs after rasterizing the outline back (mismatch); --compare-autotrace also
+times fontforge's importImage + autoTrace on the same PNGs when available.
+
+Usage:
+  python3 font-work/trace_glyphs.py font-work/glyph_png_norm --scale 2.2 --jobs 4 --svg-dir /tmp/traced
+"""
+from __future__ import annotations
+import argparse, math, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageChops, ImageDraw
+
+INK_THRESH = 128
+TOLERANCE = 0.6      # max fit error, source px
+CORNER_TOL = 1.0     # Douglas-Peucker tolerance for corner candidates, source px
+CORNER_ANGLE = 60.0  # degrees of turn that make a simplified vertex a corner
+TANGENT_SPAN = 4     # samples used to estimate end tangents (per source px)
+SPECKLE_AREA = 2     # loops enclosing at most this many source px (ink specks, pinholes) are dropped
+SMOOTH_PASSES = 3    # [1, 2, 1] passes over the samples before fitting (corners pinned), at scale 1
+
+
+def ink_mask(path, thresh: int = INK_THRESH) -> np.ndarray:
+    with Image.open(path) as im:
+        return np.asarray(im.convert("L")) < thresh
+
+
+def boundary_loops(ink: np.ndarray):
+    """Closed pixel-crack loops around the ink, ink on the right (y down); vertices as (N, 2) int arrays."""
+    H, W = ink.shape
+    p = np.pad(ink, 1)
+    core = p[1:-1, 1:-1]
+    r, c = np.nonzero(core & ~p[:-2, 1:-1]);   top = (c, r, 1, 0)
+    rb, cb = np.nonzero(core & ~p[2:, 1:-1]);  bottom = (cb + 1, rb + 1, -1, 0)
+    rl, cl = np.nonzero(core & ~p[1:-1, :-2]); left = (cl, rl + 1, 0, -1)
+    rr, cr = np.nonzero(core & ~p[1:-1, 2:]);  right = (cr + 1, rr, 0, 1)
+
+    out = {}  # vertex id -> [(dx, dy), ...]
+    for xs, ys, dx, dy in (top, bottom, left, right):
+        for v in (ys * (W + 1) + xs).tolist():
+            out.setdefault(v, []).append((dx, dy))
+
+    loops = []
+    while out:
+        start = next(iter(out))
+        v, d = start, None
+        pts = []
+        while True:
+            dirs = out.get(v)
+            if not dirs:
+                break
+            if len(dirs) > 1 and d is not None:
+                # saddle vertex: take the right turn so diagonal neighbours stay separate loops
+                want = (-d[1], d[0])
+                d = want if want in dirs else dirs[0]
+            else:
+                d = dirs[0]
+            dirs.remove(d)
+            if not dirs:
+                del out[v]
+            y, x = divmod(v, W + 1)
+            pts.append((x, y))
+            v = (y + d[1]) * (W + 1) + (x + d[0])
+        if len(pts) >= 4:
+            loops.append(np.array(pts, dtype=np.int32))
+    return loops
+
+
+def _seg_dist(pts, a, b):
+    ab = b - a
+    L = math.hypot(ab[0], ab[1])
+    if L == 0:
+        return np.hypot(pts[:, 0] - a[0], pts[:, 1] - a[1])
+    return np.abs(ab[0] * (pts[:, 1] - a[1]) - ab[1] * (pts[:, 0] - a[0])) / L
+
+
+def rdp_closed(pts: np.ndarray, tol: float):
+    """Douglas-Peucker on a closed polyline; returns sorted indices of kept vertices."""
+    n = len(pts)
+    far = int(np.argmax(np.hypot(*(pts - pts[0]).T)))
+    keep = {0, far}
+    stack = [(0, far), (far, n)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        seg = pts[i + 1:j]
+        d = _seg_dist(seg, pts[i], pts[j % n])
+        k = int(np.argmax(d))
+        if d[k] > tol:
+            m = i + 1 + k
+            keep.add(m)
+            stack += [(i, m), (m, j)]
+    return sorted(keep)
+
+
+def find_corners(pts: np.ndarray, tol: float, corner_angle: float):
+    """Simplified vertices turning more than corner_angle; None when the loop is thinner than tol."""
+    idx = rdp_closed(pts, tol)
+    n = len(idx)
+    if n < 3:
+        return None
+    corners = []
+    cos_lim = math.cos(math.radians(corner_angle))
+    for k in range(n):
+        a, b, c = pts[idx[k - 1]], pts[idx[k]], pts[idx[(k + 1) % n]]
+        u, v = b - a, c - b
+        nu, nv = math.hypot(*u), math.hypot(*v)
+        if nu and nv and (u @ v) / (nu * nv) < cos_lim:
+            corners.append(idx[k])
+    return corners
+
+
+def _unit(v):
+    n = math.hypot(v[0], v[1])
+    return v / n if n else v
+
+
+def _bezier(ctrl, t):
+    t = t[:, None]
+    mt = 1 - t
+    return mt**3 * ctrl[0] + 3 * mt**2 * t * ctrl[1] + 3 * mt * t**2 * ctrl[2] + t**3 * ctrl[3]
+
+
+def _chord_params(pts):
+    d = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(pts, axis=0).T))])
+    return d / d[-1] if d[-1] else np.linspace(0, 1, len(pts))
+
+
+def _bernstein(u):
+    mt = 1 - u
+    return np.stack([mt**3, 3 * mt**2 * u, 3 * mt * u**2, u**3], axis=1)
+
+
+def _generate_bezier(pts, B, t1, t2):
+    p0, p3 = pts[0], pts[-1]
+    b1, b2 = B[:, 1], B[:, 2]
+    # normal equations for the two handle lengths along the unit end tangents
+    c00, c01, c11 = b1 @ b1, (b1 @ b2) * (t1 @ t2), b2 @ b2
+    tmp = pts - np.outer(B[:, 0] + b1, p0) - np.outer(b2 + B[:, 3], p3)
+    x0, x1 = t1 @ (b1 @ tmp), t2 @ (b2 @ tmp)
+    det = c00 * c11 - c01 * c01
+    seg = math.hypot(*(p3 - p0))
+    a1 = a2 = 0.0
+    if abs(det) > 1e-12:
+        a1 = (x0 * c11 - x1 * c01) / det
+        a2 = (c00 * x1 - c01 * x0) / det
+    if a1 < 1e-6 * seg or a2 < 1e-6 * seg:
+        a1 = a2 = seg / 3.0
+    return np.array([p0, p0 + t1 * a1, p3 + t2 * a2, p3])
+
+
+def _reparameterize(ctrl, diff, u):
+    """One Newton-Raphson step of every parameter towards its closest point; diff = curve(u) - pts."""
+    d1 = 3 * (ctrl[1:] - ctrl[:-1])
+    d2 = 2 * (d1[1:] - d1[:-1])
+    mt = (1 - u)[:, None]
+    t = u[:, None]
+    q1 = mt**2 * d1[0] + 2 * mt * t * d1[1] + t**2 * d1[2]
+    q2 = mt * d2[0] + t * d2[1]
+    num = np.einsum("ij,ij->i", diff, q1)
+    den = np.einsum("ij,ij->i", q1, q1) + np.einsum("ij,ij->i", diff, q2)
+    step = np.divide(num, den, out=np.zeros_like(num), where=np.abs(den) > 1e-12)
+    return np.clip(u - step, 0.0, 1.0)
+
+
+def _fit_one(pts, t1, t2, tol):
+    """Best single cubic for pts with fixed end tangents: (ctrl, worst index, worst squared error)."""
+    u = _chord_params(pts)
+    for it in range(4):
+        B = _bernstein(u)
+        ctrl = _generate_bezier(pts, B, t1, t2)
+        diff = B @ ctrl - pts
+        err = np.einsum("ij,ij->i", diff, diff)
+        split = int(np.argmax(err[1:-1])) + 1
+        if err[split] <= tol * tol or err[split] > 16 * tol * tol:
+            break
+        u = _reparameterize(ctrl, diff, u)
+    return ctrl, split, err[split]
+
+
+def _fit_spans(pts, t1, t2, tol, i0=0):
+    """[(ctrl, first, last)] covering pts, split at the worst point until within tol."""
+    if len(pts) <= 2:
+        L = math.hypot(*(pts[-1] - pts[0])) / 3.0
+        return [(np.array([pts[0], pts[0] + t1 * L, pts[-1] + t2 * L, pts[-1]]), i0, i0 + len(pts) - 1)]
+    ctrl, split, err = _fit_one(pts, t1, t2, tol)
+    if err <= tol * tol:
+        return [(ctrl, i0, i0 + len(pts) - 1)]
+    tc = _unit(pts[split - 1] - pts[split + 1])
+    return _fit_spans(pts[:split + 1], t1, tc, tol, i0) + _fit_spans(pts[split:], -tc, t2, tol, i0 + split)
+
+
+def fit_cubics(pts, t1, t2, tol):
+    """Schneider's least-squares cubic fit with recursive splitting; returns [ctrl (4, 2), ...].
+
+    Splitting at the worst point over-segments, so neighbouring pieces are then
+    re-fitted as one cubic wherever that stays within tol.
+    """
+    spans = _fit_spans(pts, t1, t2, tol)
+    k = 0
+    while k < len(spans) - 1:
+        (a, i0, _), (b, _, i1) = spans[k], spans[k + 1]
+        if i1 - i0 >= 3:
+            ctrl, _, err = _fit_one(pts[i0:i1 + 1], _unit(a[1] - a[0]), _unit(b[2] - b[3]), tol)
+            if err <= tol * tol:
+                spans[k:k + 2] = [(ctrl, i0, i1)]
+                k = max(0, k - 1)
+                continue
+        k += 1
+    return [ctrl for ctrl, _, _ in spans]
+
+
+def _end_tangents(run, span):
+    k = min(span, len(run) - 1)
+    return _unit(run[k] - run[0]), _unit(run[-1 - k] - run[-1])
+
+
+def fit_loop(pts: np.ndarray, tol: float, corner_angle: float, edge_ends=None, scale: float = 1.0):
+    """Fit one closed sample loop; returns segments [("line", p0, p1) | ("curve", p0, c1, c2, p3)].
+
+    tol is in px of pts; scale (px per source px) sets the corner tolerance,
+    smoothing and tangent span. edge_ends (A, B): the pixel vertices each
+    midpoint sample lies between; corners snap to whichever is farther out, so
+    square corners stay square.
+    """
+    n = len(pts)
+    span = max(1, round(TANGENT_SPAN * scale))
+    corners = find_corners(pts, max(tol, CORNER_TOL * scale), corner_angle)
+    if corners is None:
+        # specks and hairlines: keep their pixel polygon
+        if edge_ends is None:
+            return []
+        v = edge_ends[0]
+        d0, d1 = v - np.roll(v, 1, axis=0), np.roll(v, -1, axis=0) - v
+        turn = d0[:, 0] * d1[:, 1] - d0[:, 1] * d1[:, 0] != 0
+        v = v[turn]
+        return [("line", p, q) for p, q in zip(v, np.roll(v, -1, axis=0))]
+    if corners and edge_ends is not None:
+        pts = pts.copy()
+        for c in corners:
+            ref = (pts[(c - 2) % n] + pts[(c + 2) % n]) / 2
+            a, b = edge_ends[0][c], edge_ends[1][c]
+            pts[c] = a if math.hypot(*(a - ref)) >= math.hypot(*(b - ref)) else b
+    if n > 8 * scale:
+        pinned = pts[corners]
+        # [1, 2, 1] passes add variance, so the count grows with scale**2 to smooth the same source px
+        for _ in range(round(SMOOTH_PASSES * scale * scale)):
+            pts = 0.25 * np.roll(pts, 1, axis=0) + 0.5 * pts + 0.25 * np.roll(pts, -1, axis=0)
+        pts[corners] = pinned
+    if not corners:
+        # smooth loop: split at the sample farthest from the first, with a centred tangent
+        s = int(np.argmax(np.hypot(*(pts - pts[0]).T)))
+        pts = np.roll(pts, -s, axis=0)
+        tc = _unit(pts[span] - pts[-span])
+        ring = np.vstack([pts, pts[:1]])
+        return [("curve", *c) for c in fit_cubics(ring, tc, -tc, tol)]
+
+    segs = []
+    for a, b in zip(corners, corners[1:] + [corners[0] + n]):
+        run = np.take(pts, np.arange(a, b + 1), axis=0, mode="wrap")
+        if len(run) < 3 or _seg_dist(run, run[0], run[-1]).max() <= tol:
+            segs.append(("line", run[0], run[-1]))
+        else:
+            t1, t2 = _end_tangents(run, span)
+            segs += [("curve", *c) for c in fit_cubics(run, t1, t2, tol)]
+    return segs
+
+
+def _to_quadratic(segs, tol):
+    from fontTools.cu2qu import curve_to_quadratic
+
+    out = []
+    for s in segs:
+        if s[0] == "line":
+            out.append(s)
+        else:
+            q = curve_to_quadratic([tuple(p) for p in s[1:]], tol)
+            out.append(("qcurve", *(np.array(p) for p in q)))
+    return out
+
+
+def segments_to_contour(segs, quadratic: bool):
+    """fontforge point order: start on-curve, then each segment's off-curves and end point."""
+    points = [[float(segs[0][1][0]), float(segs[0][1][1]), 1]]
+    for s in segs:
+        for p in s[2:-1]:
+            points.append([float(p[0]), float(p[1]), 0])
+        points.append([float(s[-1][0]), float(s[-1][1]), 1])
+    points.pop()  # closing point repeats the start
+    return {"closed": True, "quadratic": quadratic, "points": points}
+
+
+def loop_area(loop: np.ndarray) -> float:
+    x, y = loop[:, 0].astype(np.int64), loop[:, 1].astype(np.int64)
+    return abs(int(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))) / 2.0
+
+
+def trace_ink(ink: np.ndarray, tol: float = TOLERANCE, corner_angle: float = CORNER_ANGLE,
+              quadratic: bool = False, speckle: float = SPECKLE_AREA, scale: float = 1.0) -> list:
+    """Contours of the ink mask; tol and speckle in source px, scale = px per source px."""
+    H = ink.shape[0]
+    tol *= scale
+    contours = []
+    for loop in boundary_loops(ink):
+        if loop_area(loop) <= speckle * scale * scale:
+            continue
+        # edge midpoints lie on the ideal line for any pixel staircase
+        a = loop * [1.0, -1.0] + [0.0, H]  # y up flips the walk: outer contours clockwise
+        b = np.roll(a, -1, axis=0)
+        segs = fit_loop((a + b) / 2, tol, corner_angle, (a, b), scale)
+        if not segs:
+            continue
+        if quadratic:
+            segs = _to_quadratic(segs, tol)
+        contours.append(segments_to_contour(segs, quadratic))
+    return contours
+
+
+def trace_png(path, thresh: int = INK_THRESH, **opts):
+    """Trace one PNG; opts are trace_ink's keyword arguments."""
+    return trace_ink(ink_mask(path, thresh), **opts)
+
+
+def _trace_task(path, thresh, opts):
+    return trace_png(path, thresh, **opts)
+
+
+def trace_pngs(paths, jobs: int = 1, thresh: int = INK_THRESH, **opts) -> dict:
+    """{Path: contours} for every PNG, traced on `jobs` processes.
+
+    Keyed by path, not stem, so same-named glyphs from different directories stay apart.
+    """
+    paths = [Path(p) for p in paths]
+    if jobs <= 1:
+        return {p: trace_png(p, thresh, **opts) for p in paths}
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        futures = [(p, ex.submit(_trace_task, str(p), thresh, opts)) for p in paths]
+        return {p: fut.result() for p, fut in futures}
+
+
+def node_count(contours) -> int:
+    return sum(1 for c in contours for *_, on in c["points"] if on)
+
+
+def _flatten(contour, steps: int = 16):
+    pts = contour["points"]
+    starts = [i for i, p in enumerate(pts) if p[2]]
+    out = []
+    for k, i in enumerate(starts):
+        j = starts[(k + 1) % len(starts)]
+        seg = [pts[i]] + [pts[m % len(pts)] for m in range(i + 1, j if j > i else j + len(pts))] + [pts[j]]
+        ctrl = np.array([p[:2] for p in seg], dtype=float)
+        if len(ctrl) == 4 and not contour["quadratic"]:
+            out += _bezier(ctrl, np.linspace(0, 1, steps, endpoint=False)).tolist()
+        elif len(ctrl) > 2:
+            # quadratic spline with implied on-curve points between consecutive off-curves
+            offs = ctrl[1:-1]
+            ons = [ctrl[0]] + [(offs[m] + offs[m + 1]) / 2 for m in range(len(offs) - 1)] + [ctrl[-1]]
+            for m, c in enumerate(offs):
+                t = np.linspace(0, 1, steps, endpoint=False)[:, None]
+                out += ((1 - t)**2 * ons[m] + 2 * (1 - t) * t * c + t**2 * ons[m + 1]).tolist()
+        else:
+            out.append(ctrl[0].tolist())
+    return out
+
+
+def rasterize(contours, size, ss: int = 4) -> np.ndarray:
+    """Even-odd fill of the contours (y up) back to a (H, W) bool mask at ss x ss supersampling."""
+    W, H = size
+    acc = Image.new("1", (W * ss, H * ss), 0)
+    for c in contours:
+        m = Image.new("1", acc.size, 0)
+        ImageDraw.Draw(m).polygon([(x * ss, (H - y) * ss) for x, y in _flatten(c)], fill=1)
+        acc = ImageChops.logical_xor(acc, m)
+    cover = np.asarray(acc).reshape(H, ss, W, ss).mean(axis=(1, 3))
+    return cover >= 0.5
+
+
+def write_svg(contours, size, path: Path):
+    W, H = size
+    d = []
+    for c in contours:
+        pts = c["points"]
+        d.append(f"M{pts[0][0]:.2f},{H - pts[0][1]:.2f}")
+        pending = []
+        for x, y, on in pts[1:] + [pts[0]]:
+            if not on:
+                pending.append((x, H - y))
+                continue
+            if len(pending) == 2 and not c["quadratic"]:
+                d.append("C" + " ".join(f"{px:.2f},{py:.2f}" for px, py in pending) + f" {x:.2f},{H - y:.2f}")
+            elif pending:
+                for m, (px, py) in enumerate(pending):
+                    ex, ey = ((px + pending[m + 1][0]) / 2, (py + pending[m + 1][1]) / 2) if m + 1 < len(pending) else (x, H - y)
+                    d.append(f"Q{px:.2f},{py:.2f} {ex:.2f},{ey:.2f}")
+            else:
+                d.append(f"L{x:.2f},{H - y:.2f}")
+            pending = []
+        d.append("Z")
+    path.write_text(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {W} {H}">'
+                    f'<path fill-rule="evenodd" d="{" ".join(d)}"/></svg>\n', encoding="utf-8")
+
+
+def autotrace_baseline(paths):
+    """Seconds and {Path: on-curve node count} for fontforge importImage + autoTrace, or None without fontforge."""
+    try:
+        import fontforge
+    except ImportError:
+        return None
+    f = fontforge.font()
+    nodes = {}
+    t = time.perf_counter()
+    for i, p in enumerate(paths):
+        g = f.createChar(0xE000 + i)
+        g.importImage(str(p))
+        g.autoTrace()
+        nodes[Path(p)] = sum(1 for c in g.foreground for pt in c if pt.on_curve)
+    return time.perf_counter() - t, nodes
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("inputs", nargs="+", help="Binarized glyph PNGs or directories of them")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE, help="Max fit error in source px")
+    ap.add_argument("--corner-angle", type=float, default=CORNER_ANGLE)
+    ap.add_argument("--quadratic", action="store_true", help="Emit quadratic (TrueType) contours via cu2qu")
+    ap.add_argument("--speckle", type=float, default=SPECKLE_AREA, help="Drop loops enclosing at most this many source px")
+    ap.add_argument("--scale", type=float, default=1.0,
+                    help="Input px per source px, for upscaled PNGs (glyph_png_norm: 2.2)")
+    ap.add_argument("--ink-thresh", type=int, default=INK_THRESH)
+    ap.add_argument("--jobs", type=int, default=1)
+    ap.add_argument("--svg-dir", help="Write an SVG preview per glyph")
+    ap.add_argument("--compare-autotrace", action="store_true", help="Also time fontforge autoTrace (needs fontforge)")
+    args = ap.parse_args()
+
+    paths = []
+    for p in map(Path, args.inputs):
+        paths += sorted(p.glob("*.png")) if p.is_dir() else [p]
+    if not paths:
+        raise SystemExit("No PNGs to trace")
+
+    t = time.perf_counter()
+    traced = trace_pngs(paths, jobs=args.jobs, thresh=args.ink_thresh, tol=args.tolerance,
+                        corner_angle=args.corner_angle, quadratic=args.quadratic, speckle=args.speckle,
+                        scale=args.scale)
+    elapsed = time.perf_counter() - t
+
+    baseline = autotrace_baseline(paths) if args.compare_autotrace else None
+    if args.compare_autotrace and baseline is None:
+        print("WARN: fontforge not available, autoTrace comparison skipped")
+    if args.svg_dir:
+        Path(args.svg_dir).mkdir(parents=True, exist_ok=True)
+
+    # label by stem, or by parent/stem when the same stem comes from several directories
+    stems = [p.stem for p in paths]
+    label = {p: p.stem if stems.count(p.stem) == 1 else f"{p.parent.name}_{p.stem}" for p in paths}
+    total = 0
+    for p in paths:
+        contours = traced[p]
+        ink = ink_mask(p, args.ink_thresh)
+        size = (ink.shape[1], ink.shape[0])
+        mismatch = float(np.mean(rasterize(contours, size) != ink))
+        nodes = node_count(contours)
+        total += nodes
+        extra = f"  autoTrace {baseline[1][p]:4d}" if baseline else ""
+        print(f"  {label[p]:<10} contours {len(contours):3d}  nodes {nodes:4d}{extra}  mismatch {mismatch:.4%}")
+        if args.svg_dir:
+            write_svg(contours, size, Path(args.svg_dir) / f"{label[p]}.svg")
+    print(f"Traced {len(paths)} glyphs in {elapsed:.3f}s, {total} nodes")
+    if baseline:
+        print(f"autoTrace: {baseline[0]:.3f}s, {sum(baseline[1].values())} nodes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Watch mode: keep the clock sprites and font current while glyphs are edited.
+
+Polls aligned_clean_1024/*.png, the months set (--months-dir) and
+glyph_eps_clean/*.eps by mtime and size. For a changed glyph PNG:
+  - only that glyph is reprocessed: trimmed to its alpha bbox and centred in
+    its sprite cell (the layout of glyph-sprite.png / months-sprite.png);
+  - only its cell of the in-memory sprite is rewritten;
+  - only the sprite's cell row is re-filtered and re-deflated: SpritePNG keeps
+    one deflate segment per cell row, joined with full flushes, so the other
+    rows' compressed bytes are reused as they are;
+  - the PNG is replaced atomically, check_sprites' per-cell QC runs on the
+    in-memory alpha, and the sprite's ?v= in graff.css is bumped.
+A changed EPS re-parses that glyph only and rebuilds the TTF + WOFF2 with the
+fontTools backend from the other glyphs' in-memory outlines (stylesheet
+references to the .woff2 get their ?v= bumped too). Every update prints its
+edit-to-output latency (file mtime to written output).
+
+The months set defaults to months_outline_sets/white_outline, which the months
+sprite is built from (see SPRITE_RUNBOOK.md). A source that fails to decode or
+parse is warned about once per (mtime, size) and counts as seen: the other
+changes still go out, its cell or outline keeps the last good version, and it
+is retried quietly with backoff (RETRY_S doubling up to RETRY_MAX_S) until it
+changes again. A deleted glyph PNG blanks its cell.
+
+The font goes to --font-out (default: font-work/watch/JanGraffClock.ttf), not
+to font-work/JanGraffClock.ttf: that is the hinted fontforge build, and the
+watch rebuild is the unhinted fontTools one.
+
+Usage:
+  python3 font-work/watch_sprites.py
+  python3 font-work/watch_sprites.py --months-dir font-work/graffiti_months_cleaned_pack --interval 0.1
+  python3 font-work/watch_sprites.py --rebuild --once   # re-render every cell from its source and exit
+"""
+from __future__ import annotations
+import argparse, os, re, struct, time, zlib
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import build_clock_font_from_clean_eps as clean_eps
+from build_sprite_atlas import DIGIT_NAMES, FILE_NAMES, MONTH_NAMES
+from check_sprites import cell_failures, cell_metrics, cell_view, checks
+from fonttools_backend import build_ttf
+from outline_store import STORE_NAME, load_store
+from web_font import WOFF2_MISSING, woff2_available, write_woff2
+
+ROOT = Path(__file__).resolve().parents[1]
+FONT_WORK = ROOT / "font-work"
+FONTS_DIR = ROOT / "client" / "public" / "fonts"
+CSS = ROOT / "client" / "src" / "styles" / "graff.css"
+
+DIGITS_DIR = FONT_WORK / "graffiti_numbers_cleaned_pack" / "aligned_clean_1024"
+MONTHS_DIR = FONT_WORK / "months_outline_sets" / "white_outline"
+EPS_DIR = FONT_WORK / "glyph_eps_clean"
+WATCH_DIR = FONT_WORK / "watch"
+
+POLL_S = 0.1
+RETRY_S = 0.5  # first quiet retry of a source that failed at an unchanged stamp
+RETRY_MAX_S = 30.0
+PNG_LEVEL = 6  # zlib level; the committed sprites use PIL's default (6)
+ADLER_BASE = 65521
+
+
+def adler32_combine(a1: int, a2: int, len2: int) -> int:
+    """Adler-32 of A+B from adler32(A), adler32(B) and len(B) (zlib's adler32_combine)."""
+    rem = len2 % ADLER_BASE
+    s1 = a1 & 0xFFFF
+    s2 = (rem * s1) % ADLER_BASE
+    s1 += (a2 & 0xFFFF) + ADLER_BASE - 1
+    s2 += (a1 >> 16) + (a2 >> 16) + ADLER_BASE - rem
+    return ((s2 % ADLER_BASE) << 16) | (s1 % ADLER_BASE)
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+class SpritePNG:
+    """RGBA PNG encoder that re-compresses only the row bands that changed.
+
+    Each band's first scanline is stored unfiltered and the rest use the Up
+    filter, so a band never depends on its neighbours. Bands are raw-deflated
+    separately, ended with a full flush (the last one finishes the stream) and
+    concatenated; the zlib trailer's Adler-32 is combined from per-band sums.
+    """
+
+    def __init__(self, rgba: np.ndarray, band_h: int, level: int = PNG_LEVEL):
+        self.rgba = rgba
+        self.level = level
+        H = rgba.shape[0]
+        self.bands = [(y, min(H, y + band_h)) for y in range(0, H, band_h)]
+        self.segments = [None] * len(self.bands)
+        for i in range(len(self.bands)):
+            self._encode(i)
+
+    def _encode(self, i: int):
+        y0, y1 = self.bands[i]
+        H, W = self.rgba.shape[:2]
+        raw = self.rgba[y0:y1].reshape(y1 - y0, W * 4)
+        f = np.empty((y1 - y0, W * 4 + 1), np.uint8)
+        f[0, 0], f[0, 1:] = 0, raw[0]
+        f[1:, 0] = 2
+        np.subtract(raw[1:], raw[:-1], out=f[1:, 1:])
+        data = f.tobytes()
+        c = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        last = i == len(self.bands) - 1
+        self.segments[i] = (c.compress(data) + c.flush(zlib.Z_FINISH if last else zlib.Z_FULL_FLUSH),
+                            zlib.adler32(data), len(data))
+
+    def update(self, y0: int, y1: int):
+        """Re-encode the bands overlapping rows y0:y1."""
+        for i, (b0, b1) in enumerate(self.bands):
+            if b0 < y1 and y0 < b1:
+                self._encode(i)
+
+    def tobytes(self) -> bytes:
+        H, W = self.rgba.shape[:2]
+        adler = 1
+        for _, a, n in self.segments:
+            adler = adler32_combine(adler, a, n)
+        idat = b"\x78\x9c" + b"".join(s for s, _, _ in self.segments) + struct.pack(">I", adler)
+        return (b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", struct.pack(">IIBBBBB", W, H, 8, 6, 0, 0, 0))
+                + _chunk(b"IDAT", idat) + _chunk(b"IEND", b""))
+
+
+def write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def bump_css(css: Path, filename: str):
+    """Increment the ?v= cache-buster of url(".../filename?v=N") in the stylesheet; new N or None."""
+    pat = re.compile(rf"(/{re.escape(filename)}\?v=)(\d+)")
+    text = css.read_text(encoding="utf-8")
+    m = pat.search(text)
+    if m is None:
+        return None
+    v = int(m.group(2)) + 1
+    css.write_text(pat.sub(lambda mm: f"{mm.group(1)}{v}", text), encoding="utf-8")
+    return v
+
+
+def render_glyph(path: Path, cell) -> np.ndarray:
+    """(ch, cw, 4) cell: the glyph's alpha bbox centred (rounded down) in the cell."""
+    cw, ch = cell
+    out = np.zeros((ch, cw, 4), np.uint8)
+    if not path.exists():
+        return out
+    with Image.open(path) as im:
+        im = im.convert("RGBA")
+    bb = im.getchannel("A").getbbox()
+    if bb is None:
+        return out
+    g = np.asarray(im.crop(bb))
+    h, w = g.shape[:2]
+    if w > cw or h > ch:
+        print(f"WARN: {path.name} ink {w}x{h} is larger than the {cw}x{ch} cell; clipped")
+    ox, oy = (cw - w) // 2, (ch - h) // 2
+    sx, sy = max(0, -ox), max(0, -oy)
+    w, h = min(w - sx, cw), min(h - sy, ch)
+    out[max(0, oy):max(0, oy) + h, max(0, ox):max(0, ox) + w] = g[sy:sy + h, sx:sx + w]
+    return out
+
+
+class Sprite:
+    """One 4x3 sprite held in memory: its cells, encoder and QC settings."""
+
+    def __init__(self, path: Path, src_dir: Path, names, cols: int = 4, rows: int = 3):
+        self.path, self.src_dir, self.cols, self.rows = path, src_dir, cols, rows
+        with Image.open(path) as im:
+            self.rgba = np.array(im.convert("RGBA"))
+        H, W = self.rgba.shape[:2]
+        self.cell = (W // cols, H // rows)
+        self.sources = {src_dir / f"{FILE_NAMES.get(n, n)}.png": i for i, n in enumerate(names)}
+        qc = {p.name: (blank, shared) for p, _, _, blank, shared in checks}
+        self.blank, self.shared_baseline = qc.get(path.name, (set(), True))
+        self.png = SpritePNG(self.rgba, self.cell[1])
+
+    def patch(self, src: Path):
+        """Re-render the cell of one source glyph; returns the changed row range."""
+        r, c = divmod(self.sources[src], self.cols)
+        cw, ch = self.cell
+        self.rgba[r * ch:(r + 1) * ch, c * cw:(c + 1) * cw] = render_glyph(src, self.cell)
+        return r * ch, (r + 1) * ch
+
+    def qc(self) -> list:
+        cells = cell_view(self.rgba[..., 3], self.cols, self.rows)
+        return cell_failures(cell_metrics(cells), self.blank, self.shared_baseline, cells.shape[1])
+
+    def flush(self, rows) -> int:
+        for y0, y1 in rows:
+            self.png.update(y0, y1)
+        data = self.png.tobytes()
+        write_atomic(self.path, data)
+        return len(data)
+
+
+class FontWatch:
+    """Laid-out outlines of every EPS glyph; a change re-parses one and rebuilds the font."""
+
+    def __init__(self, eps_dir: Path, ttf: Path, woff2: Path):
+        self.ttf, self.woff2 = ttf, woff2
+        self.sources = {eps_dir / f"{name}.eps": (name, cp) for name, cp in clean_eps.MAP.items()}
+        self.store = load_store(eps_dir / STORE_NAME)
+        self.glyphs = {}
+        for eps in self.sources:
+            if eps.exists():
+                self.update(eps)
+
+    def update(self, eps: Path):
+        name, cp = self.sources[eps]
+        if eps.exists():
+            self.glyphs[cp] = clean_eps.fonttools_glyph(name, str(eps), self.store)
+        else:
+            self.glyphs.pop(cp, None)
+
+    def build(self):
+        build_ttf(self.glyphs, str(self.ttf), clean_eps.FONT_NAME, clean_eps.EM, clean_eps.ASCENT,
+                  clean_eps.DESCENT, clean_eps.ADV_PUNCT)
+        if self.woff2 is not None:
+            write_woff2(str(self.ttf), str(self.woff2), clean_eps.MAP.values(), keep_hinting=clean_eps.WEB_HINTING)
+
+
+def stamps(paths):
+    """{path: (mtime_ns, size)} of the paths that exist."""
+    out = {}
+    for p in paths:
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        out[p] = (st.st_mtime_ns, st.st_size)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--digits-dir", default=str(DIGITS_DIR))
+    ap.add_argument("--months-dir", default=str(MONTHS_DIR), help="Month PNGs the months sprite is built from")
+    ap.add_argument("--eps-dir", default=str(EPS_DIR))
+    ap.add_argument("--fonts-dir", default=str(FONTS_DIR), help="Directory holding glyph-sprite.png and months-sprite.png")
+    ap.add_argument("--font-out", default=str(WATCH_DIR / f"{clean_eps.FONT_NAME}.ttf"),
+                    help="TTF rebuilt on EPS changes, .woff2 written next to it "
+                         f"(default: font-work/watch/{clean_eps.FONT_NAME}.ttf, apart from the fontforge build)")
+    ap.add_argument("--css", default=str(CSS), help="Stylesheet whose ?v= cache-busters are bumped")
+    ap.add_argument("--no-css", action="store_true", help="Leave the stylesheet alone")
+    ap.add_argument("--interval", type=float, default=POLL_S, help=f"Poll interval in seconds (default: {POLL_S})")
+    ap.add_argument("--rebuild", action="store_true", help="Re-render every cell from its source on start")
+    ap.add_argument("--once", action="store_true", help="Exit after start-up instead of watching")
+    args = ap.parse_args()
+
+    fonts = Path(args.fonts_dir)
+    sprites = []
+    for name, src, names in [("glyph-sprite.png", Path(args.digits_dir), DIGIT_NAMES),
+                             ("months-sprite.png", Path(args.months_dir), MONTH_NAMES)]:
+        if not (fonts / name).exists():
+            raise SystemExit(f"No sprite at {fonts / name}; build it first")
+        if not src.is_dir():
+            print(f"WARN: {src} does not exist; {name} cells are not watched")
+        sprites.append(Sprite(fonts / name, src, names))
+    ttf = Path(args.font_out)
+    ttf.parent.mkdir(parents=True, exist_ok=True)
+    woff2 = ttf.with_suffix(".woff2") if woff2_available() else None
+    if woff2 is None:
+        print(f"WARN: {WOFF2_MISSING}; EPS edits rebuild the TTF only")
+    font = FontWatch(Path(args.eps_dir), ttf, woff2)
+    css = None if args.no_css else Path(args.css)
+
+    def apply(changed):
+        """Process changed sources; returns {path: error} for the ones that could not be read."""
+        failed = {}
+        for sp in sprites:
+            rows = []
+            for src in [p for p in changed if p in sp.sources]:
+                try:
+                    rows.append(sp.patch(src))
+                except (OSError, SyntaxError, ValueError) as e:
+                    failed[src] = e
+            if not rows:
+                continue
+            size = sp.flush(rows)
+            v = bump_css(css, sp.path.name) if css is not None and css.exists() else None
+            failures = sp.qc()
+            print(f"{sp.path.name}: {len(rows)} cell(s) patched, {size} bytes" + (f", ?v={v}" if v else "")
+                  + ("" if not failures else "\n  QC FAIL: " + "\n  QC FAIL: ".join(failures)))
+        eps = []
+        for p in [p for p in changed if p in font.sources]:
+            try:
+                font.update(p)
+            except (OSError, ValueError) as e:
+                failed[p] = e
+            else:
+                eps.append(p)
+        if eps:
+            try:
+                font.build()
+            except (OSError, ValueError) as e:
+                failed.update((p, e) for p in eps)
+            else:
+                v = bump_css(css, font.woff2.name) if font.woff2 and css is not None and css.exists() else None
+                print(f"{font.ttf.name}: rebuilt {', '.join(p.stem for p in eps)} ({len(font.glyphs)} glyphs)"
+                      + (f", ?v={v}" if v else ""))
+        return failed
+
+    watched = [p for sp in sprites for p in sp.sources] + list(font.sources)
+    seen = stamps(watched)
+    bad = {}  # path -> (stamp, next retry, delay) of sources that failed at that stamp
+
+    def settle(changed, now, failed):
+        """Mark changed sources seen; warn once per stamp about failures and schedule quiet retries."""
+        t = time.monotonic()
+        for p in changed:
+            if p in now:
+                seen[p] = now[p]
+            else:
+                seen.pop(p, None)
+            if p not in failed:
+                bad.pop(p, None)
+                continue
+            stamp, _, delay = bad.get(p, (None, 0.0, 0.0))
+            if stamp != now.get(p):
+                print(f"WARN: {p.name}: {failed[p]}; skipped until it changes")
+                delay = RETRY_S
+            else:
+                delay = min(delay * 2, RETRY_MAX_S)
+            bad[p] = (now.get(p), t + delay, delay)
+
+    if args.rebuild:
+        t = time.perf_counter()
+        settle(list(seen), seen, apply(list(seen)))
+        print(f"Rebuilt from {len(seen)} sources in {time.perf_counter() - t:.2f}s")
+    if args.once:
+        return
+
+    print(f"Watching {len(watched)} sources every {args.interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.interval)
+            now = stamps(watched)
+            due = time.monotonic()
+            changed = [p for p in watched if now.get(p) != seen.get(p)
+                       or (p in bad and bad[p][0] == now.get(p) and bad[p][1] <= due)]
+            if not changed:
+                continue
+            t = time.perf_counter()
+            failed = apply(changed)
+            settle(changed, now, failed)
+            done = [p for p in changed if p not in failed]
+            if done:
+                latest = max((now[p][0] for p in done if p in now), default=None)
+                lag = f", edit-to-output {time.time() - latest / 1e9:.2f}s" if latest else ""
+                print(f"  {', '.join(p.name for p in done)}: {time.perf_counter() - t:.2f}s processing{lag}")
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
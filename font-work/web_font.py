@@ -0,0 +1,52 @@
+"""
+WOFF2 output for the clock font builds.
+
+Subsets the generated TTF to the mapped code points, drops tables the clock
+never uses (layout, FontForge/DSIG/BDF extras, unused names) and optionally the
+autoHint() instructions, then writes WOFF2. Needs fontTools with brotli
+(pip install fonttools brotli); the builds check woff2_available() before they
+start and write the TTF only when it is missing.
+"""
+from __future__ import annotations
+import os
+
+WOFF2_MISSING = "WOFF2 output needs fontTools + brotli (pip install fonttools brotli)"
+DROP_TABLES = ["FFTM", "GDEF", "GPOS", "GSUB", "DSIG", "PfEd", "BDF", "LTSH", "VDMX", "hdmx", "kern"]
+
+
+def woff2_available() -> bool:
+    try:
+        import brotli  # noqa: F401  (WOFF2 compression, needed only at save time)
+        from fontTools import subset  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def write_woff2(ttf_path: str, woff2_path: str, codepoints, keep_hinting: bool = False) -> str:
+    if not woff2_available():
+        raise SystemExit(f"ERROR: {WOFF2_MISSING}")
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.hinting = keep_hinting
+    options.layout_features = []
+    options.name_IDs = [1, 2, 3, 4, 6]
+    options.name_languages = [0x409]
+    options.notdef_outline = True
+    options.glyph_names = False
+    options.drop_tables += DROP_TABLES
+
+    font = subset.load_font(ttf_path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=sorted(set(codepoints)))
+    subsetter.subset(font)
+    subset.save_font(font, woff2_path, options)
+    font.close()
+    return woff2_path
+
+
+def report_sizes(*paths):
+    for p in paths:
+        print(f"  {os.path.basename(p)}: {os.path.getsize(p)} bytes")